@@ -0,0 +1,116 @@
+"""Low-level file-descriptor helpers shared by the on-disk logs."""
+from __future__ import annotations
+
+import contextlib
+import os
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover — Windows
+    fcntl = None
+    import msvcrt
+
+try:
+    _IOV_MAX = os.sysconf("SC_IOV_MAX")
+except (AttributeError, OSError, ValueError):  # pragma: no cover — platform dependent
+    _IOV_MAX = 1024
+
+
+def write_all(fd: int, chunks: list[bytes]) -> None:
+    """Write every chunk to ``fd`` using vectored writes where available.
+
+    Splits the list at the platform's IOV_MAX and retries short writes, so
+    callers never need to join the chunks into one buffer first.
+    """
+    if not hasattr(os, "writev"):  # pragma: no cover — Windows
+        data = b"".join(chunks)
+        while data:
+            data = data[os.write(fd, data):]
+        return
+    for start in range(0, len(chunks), _IOV_MAX):
+        batch = chunks[start:start + _IOV_MAX]
+        written = os.writev(fd, batch)
+        total = sum(len(c) for c in batch)
+        if written < total:
+            rest = b"".join(batch)[written:]
+            while rest:
+                rest = rest[os.write(fd, rest):]
+
+
+def read_all(fd: int) -> bytes:
+    """Read ``fd`` from its current offset to EOF."""
+    # One read sized from fstat normally returns the whole file; keep reading
+    # until EOF in case it was short or the file grew in between.
+    chunks: list[bytes] = []
+    chunk = os.read(fd, max(os.fstat(fd).st_size, 1 << 16))
+    while chunk:
+        chunks.append(chunk)
+        chunk = os.read(fd, 1 << 16)
+    return b"".join(chunks)
+
+
+def stat_stamp(st: os.stat_result) -> tuple[int, int, int, int]:
+    """``(mtime_ns, ctime_ns, size, inode)``: what a file cache is keyed on.
+
+    ctime cannot be set back with ``os.utime`` and a replaced file has a new
+    inode, so a same-size rewrite with its mtime restored still changes the
+    stamp. Two writes within one tick of a coarse filesystem clock can share
+    one, so integrity checks read the file instead of trusting a cache.
+    """
+    return (st.st_mtime_ns, st.st_ctime_ns, st.st_size, st.st_ino)
+
+
+def fsync_dir(path: str | os.PathLike[str]) -> None:
+    """fsync a directory, making a rename or create inside it durable."""
+    if not hasattr(os, "O_DIRECTORY"):  # pragma: no cover — Windows
+        return
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def decode_text(data: bytes) -> str:
+    """Decode UTF-8 with universal newlines, matching ``Path.read_text``."""
+    return normalize_newlines(data.decode("utf-8"))
+
+
+def normalize_newlines(text: str) -> str:
+    """Translate ``\r\n`` and ``\r`` to ``\n``, as universal-newline reads do."""
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+@contextlib.contextmanager
+def locked(fd: int, shared: bool = False) -> Iterator[None]:
+    """Hold an advisory inter-process lock on ``fd`` for the ``with`` block.
+
+    ``flock`` on POSIX (``shared`` takes LOCK_SH). Windows has no shared
+    byte-range lock, so there every lock is exclusive, on the first byte.
+    """
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        return
+    _msvcrt_lock(fd, msvcrt.LK_LOCK)  # pragma: no cover — Windows
+    try:  # pragma: no cover
+        yield
+    finally:  # pragma: no cover
+        _msvcrt_lock(fd, msvcrt.LK_UNLCK)
+
+
+def _msvcrt_lock(fd: int, mode: int) -> None:  # pragma: no cover — Windows
+    # msvcrt.locking() works from the current offset; lock byte 0 and put the
+    # offset back so reads through ``fd`` are unaffected.
+    pos = os.lseek(fd, 0, os.SEEK_CUR)
+    os.lseek(fd, 0, os.SEEK_SET)
+    try:
+        msvcrt.locking(fd, mode, 1)
+    finally:
+        os.lseek(fd, pos, os.SEEK_SET)
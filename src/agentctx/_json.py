@@ -0,0 +1,39 @@
+"""JSON helpers that use ``orjson`` when installed and stdlib ``json`` otherwise.
+
+Install the speedup with ``pip install agentctx[speedups]``.
+"""
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover — depends on the environment
+    orjson = None
+
+
+def dumps(obj: Any, *, indent: bool = False) -> bytes:
+    """Serialize ``obj`` to UTF-8 JSON bytes (2-space indent if ``indent``).
+
+    Output is equivalent JSON either way, except that orjson writes non-ASCII
+    characters unescaped and NaN/Infinity as ``null``.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+        except TypeError:
+            # Values orjson rejects but json accepts (non-str keys, ints
+            # beyond 64 bits) fall through to the stdlib encoder.
+            pass
+    return json.dumps(obj, indent=2 if indent else None).encode("utf-8")
+
+
+def loads(data: bytes | str) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson is strict about e.g. NaN and big ints; let json decide.
+            pass
+    return json.loads(data)
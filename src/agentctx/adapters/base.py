@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from typing import Iterator, Protocol, runtime_checkable
+import asyncio
+import time
+from typing import Iterable, Iterator, Protocol, runtime_checkable
 
 
 @runtime_checkable
@@ -14,3 +16,51 @@ class LLMAdapter(Protocol):
     def stream(self, messages: list[dict], system: str = "") -> Iterator[str]:
         """Send messages and yield response text chunks."""
         ...
+
+
+async def call_async(llm: LLMAdapter, messages: list[dict], system: str = "") -> str:
+    """Await ``llm.acall`` if the adapter has one, else run ``call`` in a thread.
+
+    ``acall`` is optional so the ``LLMAdapter`` protocol stays unchanged;
+    blocking adapters still get concurrency through the default executor.
+    """
+    acall = getattr(llm, "acall", None)
+    if acall is not None:
+        return await acall(messages, system)
+    return await asyncio.to_thread(llm.call, messages, system)
+
+
+def coalesce_chunks(
+    chunks: Iterable[str],
+    min_chars: int = 0,
+    flush_interval_ms: int = 0,
+) -> Iterator[str]:
+    """Merge small streamed text chunks before yielding them.
+
+    Buffers chunks until at least ``min_chars`` characters are pending or
+    ``flush_interval_ms`` has passed since the last yield, whichever comes
+    first; anything left is flushed when the stream ends. With the defaults
+    every non-empty chunk is yielded as-is.
+    """
+    if min_chars <= 0:
+        for chunk in chunks:
+            if chunk:
+                yield chunk
+        return
+
+    interval = flush_interval_ms / 1000
+    buf: list[str] = []
+    pending = 0
+    last_yield = time.monotonic()
+    for chunk in chunks:
+        if not chunk:
+            continue
+        buf.append(chunk)
+        pending += len(chunk)
+        if pending >= min_chars or (interval and time.monotonic() - last_yield >= interval):
+            yield "".join(buf)
+            buf.clear()
+            pending = 0
+            last_yield = time.monotonic()
+    if buf:
+        yield "".join(buf)
@@ -2,50 +2,67 @@ from __future__ import annotations
 
 from typing import Iterator
 
+from agentctx.adapters.base import coalesce_chunks
+
 
 class ClaudeAdapter:
     """Anthropic Claude adapter.
 
     Requires the ``anthropic`` extra: ``pip install agentctx[claude]``
+
+    ``min_chunk_chars`` / ``flush_interval_ms`` coalesce small streamed
+    chunks before ``stream()`` yields them (see ``coalesce_chunks``).
+
+    The SDK is imported and the client built on the first ``call()`` /
+    ``stream()``, so constructing the adapter is cheap.
     """
 
     def __init__(
         self,
         model: str = "claude-haiku-4-5-20251001",
         max_tokens: int = 4_096,
+        min_chunk_chars: int = 0,
+        flush_interval_ms: int = 0,
         _client=None,
     ) -> None:
-        if _client is None:
-            try:
-                from anthropic import Anthropic
-            except ImportError:
-                raise ImportError(
-                    "The 'anthropic' package is required. "
-                    "Install it with: pip install agentctx[claude]"
-                ) from None
-            _client = Anthropic()
         self._client = _client
         self.model = model
         self.max_tokens = max_tokens
+        self.min_chunk_chars = min_chunk_chars
+        self.flush_interval_ms = flush_interval_ms
 
     def call(self, messages: list[dict], system: str = "") -> str:
-        kwargs: dict = {
-            "model": self.model,
-            "max_tokens": self.max_tokens,
-            "messages": messages,
-        }
-        if system:
-            kwargs["system"] = system
-        response = self._client.messages.create(**kwargs)
+        response = self._get_client().messages.create(**self._request_kwargs(messages, system))
         return response.content[0].text
 
     def stream(self, messages: list[dict], system: str = "") -> Iterator[str]:
-        kwargs: dict = {
-            "model": self.model,
-            "max_tokens": self.max_tokens,
-            "messages": messages,
-        }
+        with self._get_client().messages.stream(**self._request_kwargs(messages, system)) as stream:
+            yield from coalesce_chunks(
+                stream.text_stream, self.min_chunk_chars, self.flush_interval_ms
+            )
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    def _get_client(self):
+        if self._client is None:
+            try:
+                from anthropic import Anthropic
+            except ImportError:
+                raise ImportError(
+                    "The 'anthropic' package is required. "
+                    "Install it with: pip install agentctx[claude]"
+                ) from None
+            self._client = Anthropic()
+        return self._client
+
+    def _request_kwargs(self, messages: list[dict], system: str) -> dict:
         if system:
-            kwargs["system"] = system
-        with self._client.messages.stream(**kwargs) as stream:
-            yield from stream.text_stream
+            return {
+                "model": self.model,
+                "max_tokens": self.max_tokens,
+                "messages": messages,
+                "system": system,
+            }
+        return {"model": self.model, "max_tokens": self.max_tokens, "messages": messages}
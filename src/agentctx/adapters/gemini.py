@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from typing import Iterator
 
+from agentctx.adapters.base import coalesce_chunks
+
 
 class GeminiAdapter:
     """Google Gemini adapter.
@@ -10,43 +12,58 @@ class GeminiAdapter:
 
     Authentication: set the ``GOOGLE_API_KEY`` environment variable, or pass
     ``api_key`` explicitly.
+
+    ``min_chunk_chars`` / ``flush_interval_ms`` coalesce small streamed
+    chunks before ``stream()`` yields them (see ``coalesce_chunks``).
+
+    The SDK is imported and the model built on the first ``call()`` /
+    ``stream()``, so constructing the adapter is cheap.
     """
 
     def __init__(
         self,
         model: str = "gemini-2.0-flash",
         api_key: str | None = None,
+        min_chunk_chars: int = 0,
+        flush_interval_ms: int = 0,
         _model_instance=None,
     ) -> None:
-        if _model_instance is None:
-            try:
-                import google.generativeai as genai
-            except ImportError:
-                raise ImportError(
-                    "The 'google-generativeai' package is required. "
-                    "Install it with: pip install agentctx[gemini]"
-                ) from None
-            if api_key:
-                genai.configure(api_key=api_key)
-            _model_instance = genai.GenerativeModel(model_name=model)
         self._model = _model_instance
+        self._api_key = api_key
         self.model = model
+        self.min_chunk_chars = min_chunk_chars
+        self.flush_interval_ms = flush_interval_ms
 
     def call(self, messages: list[dict], system: str = "") -> str:
         contents = self._convert_messages(messages, system)
-        response = self._model.generate_content(contents)
+        response = self._get_model().generate_content(contents)
         return response.text
 
     def stream(self, messages: list[dict], system: str = "") -> Iterator[str]:
         contents = self._convert_messages(messages, system)
-        for chunk in self._model.generate_content(contents, stream=True):
-            if chunk.text:
-                yield chunk.text
+        chunks = self._get_model().generate_content(contents, stream=True)
+        yield from coalesce_chunks(
+            (chunk.text for chunk in chunks), self.min_chunk_chars, self.flush_interval_ms
+        )
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
 
+    def _get_model(self):
+        if self._model is None:
+            try:
+                import google.generativeai as genai
+            except ImportError:
+                raise ImportError(
+                    "The 'google-generativeai' package is required. "
+                    "Install it with: pip install agentctx[gemini]"
+                ) from None
+            if self._api_key:
+                genai.configure(api_key=self._api_key)
+            self._model = genai.GenerativeModel(model_name=self.model)
+        return self._model
+
     @staticmethod
     def _convert_messages(messages: list[dict], system: str) -> list[dict]:
         """Convert OpenAI-style messages to Gemini content format.
@@ -55,23 +72,21 @@ class GeminiAdapter:
         support a ``"system"`` role in the content list — system instructions
         are prepended to the first user message instead.
         """
+        # Single pass: the system prompt is folded into the first user message
+        # as it is emitted, so the input list is never copied or rebuilt.
         contents: list[dict] = []
-
-        if system:
-            # Gemini v1 doesn't support system_instruction on all models;
-            # prepend to the first user message as a safe fallback.
-            first_user = next(
-                (i for i, m in enumerate(messages) if m.get("role") == "user"), None
-            )
-            if first_user is not None:
-                messages = list(messages)
-                messages[first_user] = {
-                    **messages[first_user],
-                    "content": f"{system}\n\n{messages[first_user].get('content', '')}",
-                }
-
+        pending_system = system
         for msg in messages:
-            role = "model" if msg.get("role") == "assistant" else "user"
-            contents.append({"role": role, "parts": [msg.get("content", "")]})
+            role = msg.get("role")
+            content = msg.get("content", "")
+            if role == "assistant":
+                contents.append({"role": "model", "parts": [content]})
+                continue
+            if pending_system and role == "user":
+                # Gemini v1 doesn't support system_instruction on all models;
+                # prepending to the first user message is a safe fallback.
+                content = f"{pending_system}\n\n{content}"
+                pending_system = ""
+            contents.append({"role": "user", "parts": [content]})
 
         return contents
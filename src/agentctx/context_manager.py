@@ -13,6 +13,15 @@ from agentctx.security.audit import AuditLog
 from agentctx.security.sanitizer import Sanitizer
 from agentctx.session.context_builder import ContextBuilder
 
+# A leading priority marker (one code point each) is followed by optional
+# separator chars ("🔴: text", "🔴- text") that observe() strips.
+_PRIORITY_MARKERS = "🔴🟡🟢"
+_SEPARATOR_CHARS = " :-"
+
+# Audit entries written within one turn (observer + reflector) are buffered
+# and flushed together at the end of the turn (see ``_end_turn``).
+_AUDIT_BATCH_SIZE = 16
+
 
 class ContextManager:
     """Top-level coordinator: wires together the observation log, audit log,
@@ -28,6 +37,10 @@ class ContextManager:
 
         system_prompt = ctx.build_prefix() + "\\n\\nYour task: ..."
         ctx.add_message(role="assistant", content=response)
+
+    With ``durable=True`` the observation and audit logs are each fsynced
+    once at the end of every turn that wrote to them; otherwise call
+    ``flush()`` at whatever boundary the application needs durability.
     """
 
     def __init__(
@@ -37,6 +50,7 @@ class ContextManager:
         observer_threshold: int = 30_000,
         reflector_threshold: int = 40_000,
         task_anchor: str = "",
+        durable: bool = False,
     ) -> None:
         self._config = AgentCtxConfig(
             storage_path=storage_path,
@@ -44,44 +58,54 @@ class ContextManager:
             reflector_threshold=reflector_threshold,
         )
         self._observation_log = ObservationLog(self._config.observations_path)
-        self._audit_log = AuditLog(self._config.audit_path)
+        self._audit_log = AuditLog(self._config.audit_path, batch_size=_AUDIT_BATCH_SIZE)
         self._sanitizer = Sanitizer()
         self._observer = Observer(llm, self._observation_log, self._sanitizer)
         self._reflector = Reflector(llm, self._observation_log, self._sanitizer)
         self._context_builder = ContextBuilder(self._observation_log)
         self._anchor = Anchor(task_anchor)
-        self._session_messages: list[dict] = []
+        self._durable = durable
+        # "[role]: content" for each session message, formatted once on add
+        # and reused by build() and the observer.
+        self._session_lines: list[str] = []
+        self._session_chars = 0  # running len() of session message contents
+        # (ContextBuilder prefix it was built from, prefix with the anchor);
+        # the builder memoizes on (today, log hash), this only the join.
+        self._prefix_cache: tuple[str, str] | None = None
 
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
 
     def build_prefix(self, today: date | None = None) -> str:
-        """Return the stable Block 1 prefix to prepend to any agent's system prompt."""
+        """Return the stable Block 1 prefix to prepend to any agent's system prompt.
+
+        The observation part is memoized by ``ContextBuilder.build_prefix``;
+        while it returns the same string, the anchor join is reused too.
+        """
+        obs_prefix = self._context_builder.build_prefix(today)
+        cached = self._prefix_cache
+        if cached is not None and cached[0] is obs_prefix:
+            return cached[1]
+
         parts: list[str] = []
         anchor_text = self._anchor.render()
         if anchor_text:
             parts.append(anchor_text)
-        obs_prefix = self._context_builder.build_prefix(today)
         if obs_prefix:
             parts.append(obs_prefix)
-        return "\n\n".join(parts)
+        prefix = "\n\n".join(parts)
+        self._prefix_cache = (obs_prefix, prefix)
+        return prefix
 
     def build(self, today: date | None = None) -> str:
         """Return Block 1 + Block 2 (current session) as a single string."""
-        prefix = self.build_prefix(today)
-        session_text = self._context_builder._format_session(self._session_messages)
-        if prefix and session_text:
-            return prefix + "\n\n## Current Session\n\n" + session_text
-        if prefix:
-            return prefix
-        if session_text:
-            return "## Current Session\n\n" + session_text
-        return ""
+        return ContextBuilder.assemble(self.build_prefix(today), self._session_lines)
 
     def add_message(self, role: str, content: str) -> None:
         """Record a message in the current session; auto-triggers Observer if needed."""
-        self._session_messages.append({"role": role, "content": content})
+        self._session_lines.append(ContextBuilder.session_line(role, content))
+        self._session_chars += len(content)
         if self._session_token_count() >= self._config.observer_threshold:
             self._run_observer()
 
@@ -92,11 +116,9 @@ class ContextManager:
         If omitted, defaults to 🟢.
         """
         priority = "🟢"
-        for marker in ("🔴", "🟡", "🟢"):
-            if text.startswith(marker):
-                priority = marker
-                text = text[len(marker):].lstrip(" :-").strip()
-                break
+        if text and text[0] in _PRIORITY_MARKERS:
+            priority = text[0]
+            text = text[1:].lstrip(_SEPARATOR_CHARS).strip()
 
         ed = date.fromisoformat(event_date) if event_date else date.today()
         result = self._sanitizer.sanitize_for_observation(text)
@@ -108,35 +130,58 @@ class ContextManager:
             text=result.text,
         )
 
-        prev = self._observation_log.read_raw()
+        prev_size, _ = self._observation_log.snapshot()
         self._observation_log.append(entry)
-        self._audit_log.append("manual", prev, self._observation_log.read_raw())
+        new_size, new_hash = self._observation_log.snapshot()
+        self._audit_log.record("manual", new_size - prev_size, new_hash)
+        self._end_turn()
         return entry
 
+    def flush(self) -> None:
+        """Write buffered audit entries and fsync both logs, once each."""
+        self._audit_log.sync()
+        self._observation_log.sync()
+
     def verify_integrity(self) -> bool:
-        """Return True if the observation log hash matches the last audit entry."""
-        return self._audit_log.verify(self._observation_log.read_raw())
+        """Return True if the observation log hash matches the last audit entry.
+
+        Always hashes the log as it is on disk, bypassing the stat-stamp
+        caches; the audit side is a cached read of the file's last line.
+        """
+        return self._audit_log.verify(self._observation_log.read_raw(cached=False))
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
 
+    def _end_turn(self) -> None:
+        """Single write boundary for everything a turn queued."""
+        if self._durable:
+            self.flush()
+        else:
+            self._audit_log.flush()
+
     def _session_token_count(self) -> int:
-        return sum(len(m.get("content", "")) for m in self._session_messages) // 4
+        return self._session_chars // 4
 
     def _run_observer(self) -> None:
-        messages = list(self._session_messages)
-        prev = self._observation_log.read_raw()
-        self._observer.compress(messages)
-        self._session_messages = []
-        new = self._observation_log.read_raw()
-        if new != prev:
-            self._audit_log.append("observer", prev, new)
+        # Hand the pre-formatted transcript to the Observer and only start a
+        # fresh session once it succeeds, so a failed LLM call loses nothing.
+        prev_size, prev_hash = self._observation_log.snapshot()
+        if self._session_lines:
+            self._observer.compress_transcript("\n".join(self._session_lines))
+        self._session_lines = []
+        self._session_chars = 0
+        new_size, new_hash = self._observation_log.snapshot()
+        if new_hash != prev_hash:
+            self._audit_log.record("observer", new_size - prev_size, new_hash)
         self._maybe_reflect()
+        self._end_turn()
 
     def _maybe_reflect(self) -> None:
         if self._observation_log.token_count_approx() >= self._config.reflector_threshold:
-            prev = self._observation_log.read_raw()
+            prev_size, _ = self._observation_log.snapshot()
             rewrote = self._reflector.reflect()
             if rewrote:
-                self._audit_log.append("reflector", prev, self._observation_log.read_raw())
+                new_size, new_hash = self._observation_log.snapshot()
+                self._audit_log.record("reflector", new_size - prev_size, new_hash)
@@ -1,64 +1,167 @@
 from __future__ import annotations
 
+import functools
+import hashlib
+import os
 import re
 import stat
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import date
 from pathlib import Path
 
+from agentctx._io import (
+    decode_text,
+    locked,
+    normalize_newlines,
+    read_all,
+    stat_stamp,
+    write_all,
+)
+
 PRIORITY_MARKERS = ("🔴", "🟡", "🟢")
 
-# Matches: PRIORITY observed_on:DATE event_date:DATE [relative:X]? [[EXT]]?
-_HEADER_RE = re.compile(
-    r"^([🔴🟡🟢])"
-    r"\s+observed_on:(\d{4}-\d{2}-\d{2})"
-    r"\s+event_date:(\d{4}-\d{2}-\d{2})"
-    r"(?:\s+relative:\S+)?"   # optional stored relative field — ignored on parse
-    r"(\s+\[EXT\])?"          # optional external-content tag
+# One entry per blank-line-delimited block:
+#   PRIORITY observed_on:DATE event_date:DATE [relative:X]? [[EXT]]?
+#   text (any lines up to the next blank line)
+# Blocks whose first line is not a valid header are skipped.
+_ENTRY_RE = re.compile(
+    r"(?:\A|(?<=\n\n))\s*"             # start of a block
+    r"([🔴🟡🟢])"
+    r"[^\S\n]+observed_on:(\d{4}-\d{2}-\d{2})"
+    r"[^\S\n]+event_date:(\d{4}-\d{2}-\d{2})"
+    r"(?:[^\S\n]+relative:\S+)?"         # optional stored relative field — ignored on parse
+    r"([^\S\n]+\[EXT\])?"                # optional external-content tag
+    r"[^\n]*"                              # rest of the header line
+    r"(?:\n(?!\n)([^\n]*(?:\n(?!\n)[^\n]*)*))?"  # body, up to the next blank line
 )
 
 
-@dataclass
+# Relative-lag strings for the first year, so rendering indexes instead of
+# formatting; older (or future-dated) entries fall back to an f-string.
+_LAG_STRINGS = ("today", "1_day_ago") + tuple(f"{i}_days_ago" for i in range(2, 366))
+
+
+def _lag_string(delta: int) -> str:
+    if 0 <= delta < 366:
+        return _LAG_STRINGS[delta]
+    return f"{delta}_days_ago"
+
+
+# Logs reuse a handful of distinct dates across thousands of entries, so
+# date parsing is memoised (date objects are immutable and safe to share).
+_parse_date = functools.lru_cache(maxsize=1024)(date.fromisoformat)
+
+
+@dataclass(frozen=True, slots=True)
 class ObservationEntry:
+    """One observation. Frozen: use ``dataclasses.replace`` to change a field."""
+
     priority: str        # 🔴 | 🟡 | 🟢
     observed_on: date
     event_date: date
     text: str
     external: bool = False
+    # Formatting caches. Entries are immutable, so serialize() never changes
+    # and render() only depends on ``today``.
+    _serialized: str | None = field(default=None, init=False, repr=False, compare=False)
+    _rendered: tuple[date, str] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # Length of the "PRIORITY observed_on:... event_date:..." part of
+    # _serialized, where render() splices in the relative field.
+    _header_len: int = field(default=0, init=False, repr=False, compare=False)
 
     def relative_lag(self, today: date | None = None) -> str:
         today = today or date.today()
-        delta = (today - self.event_date).days
-        if delta == 0:
-            return "today"
-        if delta == 1:
-            return "1_day_ago"
-        return f"{delta}_days_ago"
+        return _lag_string(today.toordinal() - self.event_date.toordinal())
 
     def render(self, today: date | None = None) -> str:
         """Rendered form injected into the context window (includes relative)."""
-        ext = " [EXT]" if self.external else ""
-        relative = self.relative_lag(today)
-        header = (
-            f"{self.priority} observed_on:{self.observed_on}"
-            f" event_date:{self.event_date}"
-            f" relative:{relative}{ext}"
+        today = today or date.today()
+        cached = self._rendered
+        if cached is not None and cached[0] == today:
+            return cached[1]
+        # The rendered form is the (cached) storage form with the relative
+        # field spliced in after event_date, so the dates are never re-formatted.
+        serialized = self.serialize()
+        split = self._header_len
+        rendered = (
+            f"{serialized[:split]} relative:{self.relative_lag(today)}"
+            f"{serialized[split:]}"
         )
-        return f"{header}\n{self.text}"
+        object.__setattr__(self, "_rendered", (today, rendered))
+        return rendered
 
     def serialize(self) -> str:
         """Storage form written to observations.md (no relative — computed at build time)."""
-        ext = " [EXT]" if self.external else ""
-        header = (
-            f"{self.priority} observed_on:{self.observed_on}"
-            f" event_date:{self.event_date}{ext}"
-        )
-        return f"{header}\n{self.text}"
+        if self._serialized is None:
+            ext = " [EXT]" if self.external else ""
+            header = (
+                f"{self.priority} observed_on:{self.observed_on}"
+                f" event_date:{self.event_date}"
+            )
+            object.__setattr__(self, "_header_len", len(header))
+            object.__setattr__(self, "_serialized", f"{header}{ext}\n{self.text}")
+        return self._serialized
+
+
+# Frozen-dataclass __init__ routes every field through object.__setattr__.
+# _parse() builds thousands of entries on a cold read, so it sets the slot
+# descriptors directly instead, about twice as fast. _make_entry must set
+# every field (the tests compare it against the dataclass fields).
+_set_priority = ObservationEntry.priority.__set__
+_set_observed_on = ObservationEntry.observed_on.__set__
+_set_event_date = ObservationEntry.event_date.__set__
+_set_text = ObservationEntry.text.__set__
+_set_external = ObservationEntry.external.__set__
+_set_serialized = ObservationEntry._serialized.__set__
+_set_rendered = ObservationEntry._rendered.__set__
+_set_header_len = ObservationEntry._header_len.__set__
+
+
+def _make_entry(
+    priority: str, observed_on: date, event_date: date, text: str, external: bool
+) -> ObservationEntry:
+    """Same as ``ObservationEntry(priority, observed_on, event_date, text, external)``."""
+    entry = object.__new__(ObservationEntry)
+    _set_priority(entry, priority)
+    _set_observed_on(entry, observed_on)
+    _set_event_date(entry, event_date)
+    _set_text(entry, text)
+    _set_external(entry, external)
+    _set_serialized(entry, None)
+    _set_rendered(entry, None)
+    _set_header_len(entry, 0)
+    return entry
 
 
 class ObservationLog:
     def __init__(self, path: Path) -> None:
         self.path = path
+        self._spath = os.fspath(path)  # str path for the os-level calls below
+        # Cached state derived from the file contents, updated in place by this
+        # instance's own writes. ``_stamp`` is the stat_stamp() the caches
+        # correspond to; any other stamp means the file changed out of band and
+        # every cache is dropped and rebuilt lazily from disk.
+        self._stamp: tuple[int, int, int, int] | None = None
+        self._hasher: hashlib._Hash | None = None   # running SHA-256
+        self._chars: int | None = None              # len(read_raw())
+        self._raw: str | None = None                # read_raw()
+        self._entries_cache: list[ObservationEntry] | None = None
+        # Append-mode descriptor kept open across appends, and the inode it
+        # refers to (so a deleted or replaced file gets reopened).
+        self._fd: int | None = None
+        self._fd_ino: int | None = None
+        # Descriptor on the ``.lock`` sidecar that serialises writers across
+        # processes. A sidecar rather than the log itself, because overwrite()
+        # replaces the log's inode.
+        self._lock_fd: int | None = None
+
+    def __del__(self) -> None:
+        try:
+            self.close()
+        except Exception:
+            pass
 
     # ------------------------------------------------------------------
     # File helpers
@@ -72,10 +175,124 @@ class ObservationLog:
         if not self.path.exists():
             self.path.touch()
 
-    def read_raw(self) -> str:
-        if not self.path.exists():
+    def read_raw(self, cached: bool = True) -> str:
+        """The log's text; cached until the file's ``stat_stamp()`` changes.
+
+        ``cached=False`` always reads the file, for integrity checks that
+        must not trust the stamp.
+        """
+        if not cached:
+            return self._read_file()
+        self._check_stamp()
+        return self._cached_raw()
+
+    def _cached_raw(self) -> str:
+        """read_raw() for callers that have just run _check_stamp()."""
+        if self._raw is None:
+            self._raw = self._read_file()
+        return self._raw
+
+    def _read_file(self) -> str:
+        try:
+            fd = os.open(self._spath, os.O_RDONLY)
+        except FileNotFoundError:
             return ""
-        return self.path.read_text(encoding="utf-8")
+        try:
+            with locked(self._lock(), shared=True):
+                return decode_text(read_all(fd))
+        finally:
+            os.close(fd)
+
+    def _append_fd(self) -> tuple[int, os.stat_result]:
+        """Return the append descriptor and the file's current stat."""
+        try:
+            st: os.stat_result | None = os.stat(self._spath)
+        except FileNotFoundError:
+            st = None
+        if st is None or self._fd is None or st.st_ino != self._fd_ino:
+            self._ensure_file()
+            self._close_append()
+            self._fd = os.open(self._spath, os.O_WRONLY | os.O_APPEND)
+            st = os.fstat(self._fd)
+            self._fd_ino = st.st_ino
+        return self._fd, st
+
+    def sync(self) -> None:
+        """fsync pending writes; call at turn boundaries when durability matters."""
+        if self._fd is None:
+            # Nothing appended since open or the last overwrite(), which
+            # writes through its own (since closed) descriptor.
+            if not os.path.exists(self._spath):
+                return
+            self._append_fd()
+        os.fsync(self._fd)
+
+    def _lock(self) -> int:
+        """Return the lock-sidecar descriptor, opening it on first use."""
+        if self._lock_fd is None:
+            self._ensure_file()
+            self._lock_fd = os.open(self._spath + ".lock", os.O_RDWR | os.O_CREAT, 0o600)
+        return self._lock_fd
+
+    def _close_append(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+            self._fd_ino = None
+
+    def close(self) -> None:
+        self._close_append()
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    def _stat_stamp(self) -> tuple[int, int, int, int] | None:
+        try:
+            st = os.stat(self._spath)
+        except FileNotFoundError:
+            return None
+        return stat_stamp(st)
+
+    # ------------------------------------------------------------------
+    # Cache helpers
+    # ------------------------------------------------------------------
+
+    def _invalidate(self) -> None:
+        self._hasher = None
+        self._chars = None
+        self._raw = None
+        self._entries_cache = None
+
+    def _check_stamp(self) -> None:
+        """Drop cached state if the file changed since it was cached."""
+        stamp = self._stat_stamp()
+        if stamp != self._stamp:
+            self._invalidate()
+            self._stamp = stamp
+
+    def _seed(self, content: str) -> None:
+        self._hasher = hashlib.sha256(content.encode("utf-8"))
+        self._chars = len(content)
+
+    # ------------------------------------------------------------------
+    # Hashing
+    # ------------------------------------------------------------------
+
+    def current_hash(self) -> str:
+        """SHA-256 hex digest of the log contents, maintained incrementally."""
+        return self.snapshot()[1]
+
+    def snapshot(self) -> tuple[int, str]:
+        """Return ``(length in characters, SHA-256 hex digest)`` of the log.
+
+        Both describe ``read_raw()``'s text, so the digest is what
+        ``AuditLog.verify()`` computes from a re-read. O(1) while the cache
+        is warm; reads the file once otherwise.
+        """
+        self._check_stamp()
+        if self._hasher is None or self._chars is None:
+            self._seed(self._cached_raw())
+        return self._chars, self._hasher.hexdigest()
 
     # ------------------------------------------------------------------
     # Parsing
@@ -83,53 +300,133 @@ class ObservationLog:
 
     @staticmethod
     def _parse(raw: str) -> list[ObservationEntry]:
-        entries: list[ObservationEntry] = []
-        blocks = re.split(r"\n{2,}", raw.strip())
-        for block in blocks:
-            block = block.strip()
-            if not block:
-                continue
-            parts = block.split("\n", 1)
-            header = parts[0]
-            text = parts[1].strip() if len(parts) > 1 else ""
-
-            m = _HEADER_RE.match(header)
-            if not m:
-                continue
-
-            entries.append(
-                ObservationEntry(
-                    priority=m.group(1),
-                    observed_on=date.fromisoformat(m.group(2)),
-                    event_date=date.fromisoformat(m.group(3)),
-                    text=text,
-                    external=bool(m.group(4)),
-                )
+        return [
+            _make_entry(
+                priority,
+                _parse_date(observed_on),
+                _parse_date(event_date),
+                (body or "").strip(),
+                ext is not None,
             )
-        return entries
+            for priority, observed_on, event_date, ext, body in (
+                m.groups() for m in _ENTRY_RE.finditer(raw)
+            )
+        ]
 
     def entries(self) -> list[ObservationEntry]:
-        return self._parse(self.read_raw())
+        self._check_stamp()
+        if self._entries_cache is None:
+            self._entries_cache = self._parse(self._cached_raw())
+        return list(self._entries_cache)
+
+    def render_all(self, today: date) -> str:
+        """Every entry's ``render(today)``, joined by blank lines.
+
+        Bulk equivalent of calling ``render`` per entry: ``today``'s ordinal
+        is computed once and the per-entry caches are read and filled inline.
+        """
+        self._check_stamp()
+        if self._entries_cache is None:
+            self._entries_cache = self._parse(self._cached_raw())
+        today_ord = today.toordinal()
+        parts: list[str] = []
+        for e in self._entries_cache:
+            cached = e._rendered
+            if cached is not None and cached[0] == today:
+                parts.append(cached[1])
+                continue
+            serialized = e._serialized or e.serialize()
+            split = e._header_len
+            lag = _lag_string(today_ord - e.event_date.toordinal())
+            rendered = f"{serialized[:split]} relative:{lag}{serialized[split:]}"
+            object.__setattr__(e, "_rendered", (today, rendered))
+            parts.append(rendered)
+        return "\n\n".join(parts)
 
     # ------------------------------------------------------------------
     # Writes
     # ------------------------------------------------------------------
 
     def append(self, entry: ObservationEntry) -> None:
-        self._ensure_file()
-        raw = self.read_raw()
-        separator = "\n\n" if raw.strip() else ""
-        with self.path.open("a", encoding="utf-8") as f:
-            f.write(separator + entry.serialize() + "\n")
+        self.append_many([entry])
+
+    def append_many(self, entries: list[ObservationEntry]) -> None:
+        """Append ``entries`` in order with one stat and one ``writev``."""
+        if not entries:
+            return
+        with locked(self._lock()):
+            # A stat is enough to decide on the separator — re-reading the
+            # whole log on every append made a stream of appends O(N²).
+            fd, st = self._append_fd()
+            if stat_stamp(st) != self._stamp:
+                self._invalidate()
+            chunks: list[bytes] = []
+            serialized: list[str] = []
+            chars = 0
+            for i, entry in enumerate(entries):
+                separator = "\n\n" if i or st.st_size > 0 else ""
+                # read_raw() translates newlines, so write exactly what it
+                # will return; the running hash then matches a re-read.
+                serialized.append(normalize_newlines(entry.serialize()))
+                text = separator + serialized[-1] + "\n"
+                chunks.append(text.encode("utf-8"))
+                chars += len(text)
+            write_all(fd, chunks)
+
+            # The separator guarantees a block boundary, so the parsed form of
+            # the new entries can extend the cached entries without a re-parse.
+            if self._hasher is not None:
+                for chunk in chunks:
+                    self._hasher.update(chunk)
+            if self._chars is not None:
+                self._chars += chars
+            self._raw = None
+            if self._entries_cache is not None:
+                for text in serialized:
+                    self._entries_cache.extend(self._parse(text))
+            st = os.fstat(fd)
+            self._stamp = stat_stamp(st)
 
     def overwrite(self, entries: list[ObservationEntry]) -> None:
-        """Reflector-only: rewrites the entire log in place."""
+        """Reflector-only: atomically replaces the entire log."""
         self._ensure_file()
-        if entries:
-            content = "\n\n".join(e.serialize() for e in entries) + "\n"
-        else:
-            content = ""
-        self.path.write_text(content, encoding="utf-8")
+        # Encode each entry separately and hand the pieces to writev, rather
+        # than materialising the joined log as one str and again as bytes.
+        hasher = hashlib.sha256()
+        chunks: list[bytes] = []
+        chars = 0
+        for i, e in enumerate(entries):
+            serialized = normalize_newlines(e.serialize())
+            chars += len(serialized)
+            if i:
+                chunks.append(b"\n\n")
+                chars += 2
+            chunks.append(serialized.encode("utf-8"))
+        if chunks:
+            chunks.append(b"\n")
+            chars += 1
+
+        # Write a sibling temp file and rename it over the log, so a crash
+        # mid-write leaves the previous log intact. The append descriptor
+        # still points at the old inode, so it is closed and reopened lazily.
+        with locked(self._lock()):
+            mode = stat.S_IMODE(os.stat(self._spath).st_mode)
+            tmp = self._spath + ".tmp"
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+            try:
+                write_all(fd, chunks)
+            finally:
+                os.close(fd)
+            os.replace(tmp, self._spath)
+            self._close_append()
+            st = os.stat(self._spath)
+
+        for chunk in chunks:
+            hasher.update(chunk)
+        self._invalidate()
+        self._hasher = hasher
+        self._chars = chars
+        self._stamp = stat_stamp(st)
 
     # ------------------------------------------------------------------
     # Metrics
@@ -137,4 +434,7 @@ class ObservationLog:
 
     def token_count_approx(self) -> int:
         """Rough approximation: 1 token ≈ 4 characters."""
-        return len(self.read_raw()) // 4
+        self._check_stamp()
+        if self._chars is None:
+            self._seed(self._cached_raw())
+        return self._chars // 4
@@ -1,10 +1,20 @@
 from __future__ import annotations
 
+import asyncio
+import re
 from datetime import date
 
-from agentctx.adapters.base import LLMAdapter
+from agentctx.adapters.base import LLMAdapter, call_async
 from agentctx.memory.observation_log import ObservationEntry, ObservationLog
-from agentctx.security.sanitizer import Sanitizer
+from agentctx.security.sanitizer import DEFAULT_SANITIZER, Sanitizer
+
+# One response line: optional indent, priority marker, optional separator
+# chars ("🔴: text", "🔴- text", "🔴 text"), then the observation text.
+# Multiline, and whitespace never crosses a newline, so one findall over the
+# whole response yields every marked line.
+_LINE_RE = re.compile(
+    r"^[^\S\n]*([🔴🟡🟢])[ :\-]*[^\S\n]*(.*?)[^\S\n]*$", re.MULTILINE
+)
 
 _SYSTEM = """\
 You are a memory extraction agent for an AI agent system.
@@ -31,11 +41,11 @@ class Observer:
         self,
         llm: LLMAdapter,
         observation_log: ObservationLog,
-        sanitizer: Sanitizer,
+        sanitizer: Sanitizer | None = None,
     ) -> None:
         self.llm = llm
         self.observation_log = observation_log
-        self.sanitizer = sanitizer
+        self.sanitizer = sanitizer if sanitizer is not None else DEFAULT_SANITIZER
 
     def compress(
         self,
@@ -45,48 +55,87 @@ class Observer:
         """Compress a list of messages into observations and append to the log."""
         if not messages:
             return []
+        return self.compress_transcript(self._format_prompt(messages), event_date)
 
+    def compress_transcript(
+        self, formatted: str, event_date: date | None = None
+    ) -> list[ObservationEntry]:
+        """``compress()`` for a transcript already formatted as ``[role]: content`` lines."""
         today = date.today()
-        event_date = event_date or today
-
-        formatted = "\n".join(
-            f"[{m.get('role', 'unknown')}]: {m.get('content', '')}"
-            for m in messages
-        )
-
         response = self.llm.call(
             messages=[{"role": "user", "content": formatted}],
             system=_SYSTEM,
         )
+        return self._parse_and_write(response, today=today, event_date=event_date or today)
 
-        return self._parse_and_write(response, today=today, event_date=event_date)
+    async def acompress(
+        self,
+        messages: list[dict],
+        event_date: date | None = None,
+    ) -> list[ObservationEntry]:
+        """Async ``compress()``: awaits the LLM via ``call_async``."""
+        if not messages:
+            return []
+        today = date.today()
+        response = await call_async(
+            self.llm,
+            [{"role": "user", "content": self._format_prompt(messages)}],
+            _SYSTEM,
+        )
+        return self._parse_and_write(response, today=today, event_date=event_date or today)
+
+    async def compress_batch(
+        self,
+        batches: list[list[dict]],
+        event_date: date | None = None,
+        concurrency: int = 8,
+    ) -> list[list[ObservationEntry]]:
+        """Compress several message batches with up to ``concurrency`` LLM
+        calls in flight.
+
+        Entries are appended to the log in batch order once every call has
+        returned, so a failed call leaves the log untouched.
+        """
+        today = date.today()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def request(messages: list[dict]) -> str:
+            if not messages:
+                return ""
+            async with semaphore:
+                return await call_async(
+                    self.llm,
+                    [{"role": "user", "content": self._format_prompt(messages)}],
+                    _SYSTEM,
+                )
+
+        responses = await asyncio.gather(*(request(m) for m in batches))
+        return [
+            self._parse_and_write(r, today=today, event_date=event_date or today)
+            for r in responses
+        ]
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def _format_prompt(messages: list[dict]) -> str:
+        return "\n".join([
+            f"[{m.get('role', 'unknown')}]: {m.get('content', '')}"
+            for m in messages
+        ])
+
     def _parse_and_write(
         self, response: str, today: date, event_date: date
     ) -> list[ObservationEntry]:
         entries: list[ObservationEntry] = []
+        if not response:
+            return entries
+        if "\r" in response:
+            response = response.replace("\r\n", "\n").replace("\r", "\n")
 
-        for line in response.splitlines():
-            line = line.strip()
-            if not line:
-                continue
-
-            priority = None
-            text = line
-            for marker in ("🔴", "🟡", "🟢"):
-                if line.startswith(marker):
-                    priority = marker
-                    # Handle optional separator chars: "🔴: text", "🔴- text", "🔴 text"
-                    text = line[len(marker):].lstrip(" :-").strip()
-                    break
-
-            if priority is None:
-                continue
-
+        for priority, text in _LINE_RE.findall(response):
             result = self.sanitizer.sanitize_for_observation(text)
             entry = ObservationEntry(
                 priority="🔴" if result.was_truncated else priority,
@@ -94,7 +143,7 @@ class Observer:
                 event_date=event_date,
                 text=result.text,
             )
-            self.observation_log.append(entry)
             entries.append(entry)
 
+        self.observation_log.append_many(entries)
         return entries
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from agentctx.adapters.base import LLMAdapter
+from agentctx.adapters.base import LLMAdapter, call_async
 from agentctx.memory.observation_log import ObservationLog
-from agentctx.security.sanitizer import Sanitizer
+from agentctx.security.sanitizer import DEFAULT_SANITIZER, Sanitizer
 
 _SYSTEM = """\
 You are a memory consolidation agent for an AI agent system.
@@ -31,11 +31,11 @@ class Reflector:
         self,
         llm: LLMAdapter,
         observation_log: ObservationLog,
-        sanitizer: Sanitizer,
+        sanitizer: Sanitizer | None = None,
     ) -> None:
         self.llm = llm
         self.observation_log = observation_log
-        self.sanitizer = sanitizer
+        self.sanitizer = sanitizer if sanitizer is not None else DEFAULT_SANITIZER
 
     def reflect(self) -> bool:
         """Consolidate the observation log in place.
@@ -43,19 +43,37 @@ class Reflector:
         Returns True if the log was rewritten, False if skipped (empty log or
         the LLM output produced fewer valid entries than expected).
         """
-        raw = self.observation_log.read_raw()
-        if not raw.strip():
-            return False
-
-        original_entries = self.observation_log.entries()
-        if not original_entries:
+        raw = self._prepare()
+        if raw is None:
             return False
-
         response = self.llm.call(
             messages=[{"role": "user", "content": raw}],
             system=_SYSTEM,
         )
+        return self._apply(response)
+
+    async def areflect(self) -> bool:
+        """Async ``reflect()``: awaits the LLM via ``call_async``."""
+        raw = self._prepare()
+        if raw is None:
+            return False
+        response = await call_async(self.llm, [{"role": "user", "content": raw}], _SYSTEM)
+        return self._apply(response)
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    def _prepare(self) -> str | None:
+        """Return the raw log to consolidate, or None if there is nothing to do."""
+        raw = self.observation_log.read_raw()
+        if not raw.strip():
+            return None
+        if not self.observation_log.entries():
+            return None
+        return raw
 
+    def _apply(self, response: str) -> bool:
         new_entries = ObservationLog._parse(response)
 
         # Safety check: don't silently destroy the log if the LLM produced
@@ -4,7 +4,7 @@ import re
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class ResearchItem:
     title: str
     url: str
@@ -0,0 +1,64 @@
+"""Optional Hyperscan prefilter for the injection sanitizer.
+
+Requires the ``hyperscan`` extra: ``pip install agentctx[hyperscan]``
+"""
+from __future__ import annotations
+
+import re
+import threading
+from typing import Callable
+
+
+def build_prefilter(
+    patterns: list[tuple[str, int]],
+) -> Callable[[str], frozenset[int]] | None:
+    """Compile ``(pattern, re flags)`` pairs into a Hyperscan block database.
+
+    Returns ``candidates(text) -> frozenset[int]``: the indices of the
+    patterns that may match ``text`` (empty when none can). Compiled with
+    ``HS_FLAG_PREFILTER``, so the database matches a superset of the
+    originals and never misses a hit; the caller still runs the real regex,
+    restricted to the candidate patterns.
+
+    Returns None if ``hyperscan`` is not installed or rejects a pattern.
+    """
+    try:
+        import hyperscan
+    except ImportError:
+        return None
+
+    base = (
+        hyperscan.HS_FLAG_DOTALL
+        | hyperscan.HS_FLAG_SINGLEMATCH
+        | hyperscan.HS_FLAG_PREFILTER
+        | hyperscan.HS_FLAG_UTF8
+        | hyperscan.HS_FLAG_UCP
+    )
+    db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+    try:
+        db.compile(
+            expressions=[p.encode("utf-8") for p, _ in patterns],
+            ids=list(range(len(patterns))),
+            elements=len(patterns),
+            flags=[
+                base | (hyperscan.HS_FLAG_CASELESS if f & re.IGNORECASE else 0)
+                for _, f in patterns
+            ],
+        )
+    except hyperscan.error:
+        return None
+
+    # A database's scratch space is not safe to share between threads.
+    lock = threading.Lock()
+
+    def candidates(text: str) -> frozenset[int]:
+        hits: set[int] = set()
+
+        def on_match(id_: int, start: int, end: int, flags: int, context: object) -> None:
+            hits.add(id_)
+
+        with lock:
+            db.scan(text.encode("utf-8"), match_event_handler=on_match)
+        return frozenset(hits)
+
+    return candidates
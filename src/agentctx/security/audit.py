@@ -1,13 +1,17 @@
 from __future__ import annotations
 
 import hashlib
-import json
+import os
+import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 
+from agentctx import _json
+from agentctx._io import locked, read_all, stat_stamp, write_all
 
-@dataclass
+
+@dataclass(slots=True)
 class AuditEntry:
     timestamp: str
     source: str      # observer | reflector | manual
@@ -16,8 +20,36 @@ class AuditEntry:
 
 
 class AuditLog:
-    def __init__(self, path: Path) -> None:
+    """Append-only JSONL record of every write to the observation log.
+
+    Entries are buffered in memory and written with a single ``writev`` once
+    ``batch_size`` lines are pending, or when ``flush()`` is called. The
+    default ``batch_size=1`` writes through on every append. With
+    ``durable=True`` each flush ends with one ``fsync``.
+    """
+
+    def __init__(self, path: Path, batch_size: int = 1, durable: bool = False) -> None:
         self.path = path
+        self._spath = os.fspath(path)  # str path for the os-level calls below
+        self.batch_size = batch_size
+        self.durable = durable
+        self._pending: list[bytes] = []
+        self._pending_last: AuditEntry | None = None
+        self._fd: int | None = None
+        # Last entry in the file, keyed on the stat_stamp() it was read at.
+        self._last: tuple[tuple[int, int, int, int], AuditEntry | None] | None = None
+        # (content, sha256 of it) from the last append(), so content that only
+        # grows is hashed by its new suffix instead of from the start.
+        self._running: tuple[str, hashlib._Hash] | None = None
+        # Whole-second ISO prefix reused by _timestamp() within the same second.
+        self._ts_sec = -1
+        self._ts_prefix = ""
+
+    def __del__(self) -> None:
+        try:
+            self.close()
+        except Exception:
+            pass
 
     # ------------------------------------------------------------------
     # File helpers
@@ -28,47 +60,195 @@ class AuditLog:
         if not self.path.exists():
             self.path.touch()
 
+    def _open(self) -> int:
+        if self._fd is None or not os.path.exists(self._spath):
+            self._ensure_file()
+            if self._fd is not None:
+                os.close(self._fd)
+            self._fd = os.open(self._spath, os.O_WRONLY | os.O_APPEND)
+        return self._fd
+
+    def _timestamp(self) -> str:
+        """UTC ISO-8601 timestamp, identical to ``datetime.now(timezone.utc).isoformat()``.
+
+        Only the microsecond suffix is formatted per call; the date/time prefix
+        is built once per second.
+        """
+        sec, us = divmod(time.time_ns() // 1_000, 1_000_000)
+        if sec != self._ts_sec:
+            self._ts_sec = sec
+            self._ts_prefix = datetime.fromtimestamp(sec, tz=timezone.utc).isoformat()[:-6]
+        if us:
+            return f"{self._ts_prefix}.{us:06d}+00:00"
+        return f"{self._ts_prefix}+00:00"
+
     # ------------------------------------------------------------------
     # Hashing
     # ------------------------------------------------------------------
 
     @staticmethod
-    def hash_content(content: str) -> str:
-        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+    def hash_content(content: str | bytes) -> str:
+        """SHA-256 hex digest of ``content`` (str is hashed as UTF-8)."""
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        return hashlib.sha256(content).hexdigest()
+
+    @staticmethod
+    def hash_incremental(
+        prev_hasher: hashlib._Hash | None, delta: str | bytes
+    ) -> tuple[hashlib._Hash, str]:
+        """Extend a running SHA-256 by ``delta``: ``(new hasher, hex digest)``.
+
+        ``prev_hasher`` is copied, not mutated, so it stays valid for the
+        content it already covers. Pass None to start from empty content.
+        Hashing content that grows by appends this way costs O(total bytes)
+        rather than rehashing the whole string after every append.
+        """
+        hasher = prev_hasher.copy() if prev_hasher is not None else hashlib.sha256()
+        hasher.update(delta.encode("utf-8") if isinstance(delta, str) else delta)
+        return hasher, hasher.hexdigest()
 
     # ------------------------------------------------------------------
     # Writes
     # ------------------------------------------------------------------
 
     def append(self, source: str, previous_content: str, new_content: str) -> AuditEntry:
-        self._ensure_file()
+        return self.record(
+            source,
+            char_delta=len(new_content) - len(previous_content),
+            sha256=self._content_digest(previous_content, new_content),
+        )
+
+    def _content_digest(self, previous_content: str, new_content: str) -> str:
+        """``hash_content(new_content)``, extending the running hash when the
+        last append's content was ``previous_content`` and this one extends it."""
+        running = self._running
+        if (
+            running is not None
+            and (running[0] is previous_content or running[0] == previous_content)
+            and new_content.startswith(previous_content)
+        ):
+            hasher, digest = self.hash_incremental(
+                running[1], new_content[len(previous_content):]
+            )
+        else:
+            hasher, digest = self.hash_incremental(None, new_content)
+        self._running = (new_content, hasher)
+        return digest
+
+    def record(self, source: str, char_delta: int, sha256: str) -> AuditEntry:
+        """Record a write whose size change and digest are already known
+        (e.g. from ``ObservationLog.snapshot()``), without rehashing content."""
         entry = AuditEntry(
-            timestamp=datetime.now(timezone.utc).isoformat(),
+            timestamp=self._timestamp(),
             source=source,
-            char_delta=len(new_content) - len(previous_content),
-            sha256=self.hash_content(new_content),
+            char_delta=char_delta,
+            sha256=sha256,
         )
-        with self.path.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(entry.__dict__) + "\n")
+        line = {
+            "timestamp": entry.timestamp,
+            "source": entry.source,
+            "char_delta": entry.char_delta,
+            "sha256": entry.sha256,
+        }
+        self._pending.append(_json.dumps(line) + b"\n")
+        self._pending_last = entry
+        if len(self._pending) >= self.batch_size:
+            self.flush()
         return entry
 
+    def flush(self) -> None:
+        """Write all pending entries in one ``writev`` call."""
+        if not self._pending:
+            return
+        fd = self._open()
+        pending, self._pending = self._pending, []
+        # The lock keeps batches from concurrent writers from interleaving.
+        with locked(fd):
+            write_all(fd, pending)
+        if self.durable:
+            os.fsync(fd)
+        st = os.fstat(fd)
+        self._last = (stat_stamp(st), self._pending_last)
+        self._pending_last = None
+
+    def sync(self) -> None:
+        """Flush pending entries and fsync the file, regardless of ``durable``."""
+        self.flush()
+        if self._fd is not None:
+            os.fsync(self._fd)
+
+    def close(self) -> None:
+        self.flush()
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
     # ------------------------------------------------------------------
     # Reads
     # ------------------------------------------------------------------
 
     def all_entries(self) -> list[AuditEntry]:
-        if not self.path.exists():
+        self.flush()
+        try:
+            fd = os.open(self._spath, os.O_RDONLY)
+        except FileNotFoundError:
             return []
-        entries = []
-        for line in self.path.read_text(encoding="utf-8").splitlines():
-            line = line.strip()
-            if line:
-                entries.append(AuditEntry(**json.loads(line)))
-        return entries
+        try:
+            with locked(fd, shared=True):
+                data = read_all(fd)
+        finally:
+            os.close(fd)
+        return [
+            AuditEntry(**_json.loads(line))
+            for line in data.splitlines()
+            if line.strip()
+        ]
 
     def last_entry(self) -> AuditEntry | None:
-        entries = self.all_entries()
-        return entries[-1] if entries else None
+        """Most recent entry, read from the tail of the file.
+
+        Cached until the file's ``stat_stamp()`` changes, so repeated calls after
+        this instance's own writes never touch the file contents.
+        """
+        self.flush()
+        try:
+            st = os.stat(self._spath)
+        except FileNotFoundError:
+            self._last = None
+            return None
+        stamp = stat_stamp(st)
+        if self._last is not None and self._last[0] == stamp:
+            return self._last[1]
+        line = self._read_last_line()
+        entry = AuditEntry(**_json.loads(line)) if line else None
+        self._last = (stamp, entry)
+        return entry
+
+    def _read_last_line(self, block_size: int = 4096) -> bytes:
+        """Return the last non-blank line, reading backwards block by block."""
+        fd = os.open(self._spath, os.O_RDONLY)
+        try:
+            with locked(fd, shared=True):
+                end = os.lseek(fd, 0, os.SEEK_END)
+                parts: list[bytes] = []   # pieces of the line, last piece first
+                while end > 0:
+                    start = max(0, end - block_size)
+                    os.lseek(fd, start, os.SEEK_SET)
+                    block = os.read(fd, end - start)
+                    end = start
+                    if not parts:
+                        block = block.rstrip()   # skip trailing blank lines
+                        if not block:
+                            continue
+                    newline = block.rfind(b"\n")
+                    if newline != -1:
+                        parts.append(block[newline + 1:])
+                        break
+                    parts.append(block)
+                return b"".join(reversed(parts)).strip()
+        finally:
+            os.close(fd)
 
     def last_hash(self) -> str | None:
         entry = self.last_entry()
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import functools
+import os
 import re
 from dataclasses import dataclass, field
 from enum import Enum
+from typing import Callable, Iterable
 
 # (pattern, flags) pairs — order matters; more specific patterns first
 _INJECTION_PATTERNS: list[tuple[str, int]] = [
@@ -35,11 +38,254 @@ _INJECTION_PATTERNS: list[tuple[str, int]] = [
     (r"\|\s*im_start\s*\|", 0),
 ]
 
-_COMPILED = [(re.compile(p, f), p) for p, f in _INJECTION_PATTERNS]
+# Rule name for each entry of _INJECTION_PATTERNS (same order); used as the
+# named group of that branch in the fused regex and in per-rule counts.
+_RULE_NAMES = (
+    "ignore_previous",
+    "you_are_now",
+    "new_instructions",
+    "forget",
+    "act_as",
+    "markdown_header",
+    "xml_system",
+    "xml_instructions",
+    "inst_tokens",
+    "im_start_block",
+    "im_start_token",
+)
+
+
+# Patterns are compiled on first use (_get_compiled / _get_combined) rather
+# than at import, so workflows that never sanitize skip the regex builds.
+@functools.cache
+def _get_compiled() -> list[re.Pattern[str]]:
+    """Per-pattern compiled list; _strip redacts with these, in order."""
+    return [re.compile(p, f) for p, f in _INJECTION_PATTERNS]
+
+
+def _scoped(pattern: str, flags: int) -> str:
+    """Wrap ``pattern`` in a group carrying its own inline flags."""
+    letters = ("i" if flags & re.IGNORECASE else "") + ("s" if flags & re.DOTALL else "")
+    return f"(?{letters}:{pattern})"
+
+
+# For each pattern, at least one lowercase literal that every match must
+# contain. Text containing none of them cannot match, so the regex pass is
+# skipped. Keep in sync with _INJECTION_PATTERNS.
+_ANCHORS = (
+    "ignore", "disregard", "forget", "override",   # previous instructions / forget
+    "now",                                          # you are now
+    "instruction",                                  # new instructions: / <instructions>
+    "act", "behave", "pretend", "roleplay",         # act as
+    "#",                                            # ### system:
+    "system",                                       # <system>
+    "[inst]",                                       # [INST]
+    "im_start",                                     # <|im_start|>, | im_start |
+)
+
+# The only non-ASCII characters that IGNORECASE matches against ASCII
+# letters: İ and ı (i), ſ (s), Kelvin sign (k).
+_CASE_VARIANTS = "\u0130\u0131\u017f\u212a"
+# What str.lower() leaves of them, and the ASCII letter it stands for
+# ("İ" lowers to "i" plus a combining dot; the Kelvin sign lowers to "k").
+# Dropping every combining dot can only add anchor hits, never lose one.
+_LOWER_FOLDS = (("\u0307", ""), ("\u0131", "i"), ("\u017f", "s"))
+
+# Every pattern above starts with one of these characters (either case).
+# Update this when adding a pattern with a new leading character.
+_FIRST_CHARS = "abdfhinoprsuy#<[|"
+
+
+# ASCII characters that stdlib ``\s`` matches beyond RE2's [\t\n\f\r ].
+_RE_ONLY_SPACES = "\x0b\x1c\x1d\x1e\x1f"
+
+
+def _plain(text: str) -> bool:
+    """True if ``re`` and an ASCII-class engine (RE2, Hyperscan) agree on
+    ``text``: it is ASCII and has none of ``_RE_ONLY_SPACES``.
+
+    Those engines have ASCII-only whitespace and word classes and no İ/ı
+    case folding, so on other text a miss from them does not mean the
+    patterns cannot match.
+    """
+    return text.isascii() and not any(c in text for c in _RE_ONLY_SPACES)
+
+
+def _compile_combined(
+    rules: frozenset[int] | None = None, stdlib: bool = False
+) -> re.Pattern[str]:
+    """Fuse the patterns (all, or the ``rules`` indices) into one alternation
+    so text with no injection is cleared by a single scan.
+
+    Each alternative keeps its own flags (e.g. [INST] stays case-sensitive)
+    and is a named group, so ``Match.lastgroup`` tells which rule fired.
+    It only detects: where matches overlap it keeps the leftmost, so
+    redaction uses the per-rule patterns (see ``_strip``).
+
+    With ``AGENTCTX_REGEX=re2`` and the ``re2`` extra installed
+    (``pip install agentctx[re2]``) the alternation runs on RE2's linear-time
+    engine instead; otherwise, or if ``re2`` is missing, the stdlib is used.
+    ``stdlib=True`` forces the stdlib, for text that is not ``_plain``.
+    """
+    alternation = "|".join(
+        f"(?P<{name}>{_scoped(p, f)})"
+        for i, (name, (p, f)) in enumerate(zip(_RULE_NAMES, _INJECTION_PATTERNS))
+        if rules is None or i in rules
+    )
+    if not stdlib and os.environ.get("AGENTCTX_REGEX") == "re2":
+        try:
+            import re2
+        except ImportError:
+            pass
+        else:
+            return re2.compile(alternation)
+    # RE2 has no lookahead; on the stdlib engine a leading lookahead lets
+    # most positions be rejected without trying every alternative. It must
+    # also admit the non-ASCII case variants ("İgnore ...").
+    first = re.escape(_FIRST_CHARS + _FIRST_CHARS.upper() + _CASE_VARIANTS)
+    return re.compile(f"(?=[{first}])(?:{alternation})")
+
+
+# Keyed on the rule subset; the full set is the ``None`` entry.
+_get_combined = functools.lru_cache(maxsize=64)(_compile_combined)
+
+
+def _load_prefilter() -> Callable[[str], frozenset[int]] | None:
+    """Hyperscan prefilter, enabled with ``AGENTCTX_PREFILTER=hyperscan``.
+
+    Reports which patterns may match: clean text (the common case) skips the
+    regex pass entirely, and other text is scanned with an alternation of
+    only the candidate patterns. Patterns that cannot match anywhere never
+    affect a leftmost-first alternation, so the result is unchanged. Returns
+    None when not enabled or when ``hyperscan`` is unavailable. Its
+    classes and case folding are ASCII-only, so ``_strip`` skips it for
+    text that is not ``_plain``.
+    """
+    if os.environ.get("AGENTCTX_PREFILTER") != "hyperscan":
+        return None
+    from agentctx.security._hs_backend import build_prefilter
+
+    return build_prefilter(_INJECTION_PATTERNS)
+
+
+# Built on first use, like the compiled patterns.
+_get_prefilter = functools.cache(_load_prefilter)
+
+
+_RuleCounts = tuple[tuple[str, int], ...]   # ((rule name, hits), ...)
+
+
+def _strip(content: str) -> tuple[str, int, _RuleCounts]:
+    lowered = content.lower()
+    if not content.isascii():
+        for variant, letter in _LOWER_FOLDS:
+            if variant in lowered:
+                lowered = lowered.replace(variant, letter)
+    if not any(anchor in lowered for anchor in _ANCHORS):
+        return content.strip(), 0, ()
+    combined = None
+    rules: Iterable[int] = range(len(_INJECTION_PATTERNS))
+    plain = _plain(content)
+    # Hyperscan shares RE2's ASCII classes and folding: only consulted on
+    # plain text.
+    prefilter = _get_prefilter() if plain else None
+    if prefilter is not None:
+        candidates = prefilter(content)
+        if not candidates:
+            return content.strip(), 0, ()
+        if len(candidates) < len(_INJECTION_PATTERNS):
+            combined = _get_combined(candidates)
+            rules = sorted(candidates)
+    if combined is None:
+        combined = _get_combined(None, not plain)
+    if combined.search(content) is None:
+        return content.strip(), 0, ()
+
+    # Redact rule by rule, in pattern order, so what one rule leaves of an
+    # overlapping payload is rescanned by the rules after it; the fused
+    # regex would keep only the leftmost match. "[REDACTED]" never completes
+    # a match, so a rule with no hit in the input (or not a candidate) has
+    # none afterwards either.
+    compiled = _get_compiled()
+    hits: dict[str, int] = {}
+    count = 0
+    for i in rules:
+        content, n = compiled[i].subn("[REDACTED]", content)
+        if n:
+            hits[_RULE_NAMES[i]] = n
+            count += n
+    return content.strip(), count, tuple(hits.items())
+
+
+# Retries, replays and identical tool outputs sanitize the same text again;
+# results for inputs up to this size are memoised. Larger inputs bypass the
+# cache so it never pins big strings in memory.
+_CACHE_MAX_CHARS = 16_384
+
+_strip_cached = functools.lru_cache(maxsize=1024)(_strip)
+
+
+def _strip_detailed(content: str) -> tuple[str, int, _RuleCounts]:
+    """Return ``(stripped text, injection count, per-rule counts)``."""
+    if len(content) > _CACHE_MAX_CHARS:
+        return _strip(content)
+    return _strip_cached(content)
+
+
+def _strip_injections(content: str) -> tuple[str, int]:
+    """Return ``(stripped text, injection count)`` for ``content``."""
+    text, count, _ = _strip_detailed(content)
+    return text, count
+
+
+def sanitize_cache_clear() -> None:
+    """Drop memoised sanitizer results (e.g. between tests)."""
+    _strip_cached.cache_clear()
+
 
 # Default per-entry character budget (~500 tokens at 4 chars/token)
 DEFAULT_MAX_ENTRY_CHARS = 2_000
 
+# Inputs longer than this multiple of the budget are only scanned up to it;
+# everything past the budget is truncated away anyway.
+_SCAN_WINDOW_FACTOR = 8
+
+# A match that starts inside the window and ends within this many characters
+# past it is scanned whole (see _extend_window).
+_EDGE_CHARS = 1024
+
+
+def _extend_window(text: str, window: int) -> int:
+    """Move the ``window`` edge to the end of any match that straddles it.
+
+    Cutting such a match would leave its head unredacted in the output. Only
+    matches starting within ``_EDGE_CHARS`` before the edge and ending
+    within ``_EDGE_CHARS`` after it are found; a longer one is still cut,
+    and block openers are left to the unclosed-block pass below.
+    """
+    start, endpos = max(0, window - _EDGE_CHARS), window + _EDGE_CHARS
+    combined = _get_combined(None, not _plain(text[start:endpos]))
+    end = window
+    for m in combined.finditer(text, start, endpos):
+        if m.start() >= window:
+            break
+        # A match running into endpos may continue past it (e.g. "$").
+        if m.end() < endpos:
+            end = max(end, m.end())
+    return end
+
+
+# A block opener left in a capped window may be closed beyond it, where the
+# full-text scan would have matched it; redact from the opener to the end.
+_UNCLOSED_BLOCK_PATTERN = (
+    r"(?:(?i:<\s*system\s*>|<\s*instructions?\s*>)|\[INST\])[\s\S]*\Z"
+)
+
+
+@functools.cache
+def _get_unclosed_block() -> re.Pattern[str]:
+    return re.compile(_UNCLOSED_BLOCK_PATTERN)
+
 
 class TrustTier(Enum):
     """Trust tiers for spotlighting external content in prompts.
@@ -57,11 +303,19 @@ class TrustTier(Enum):
     UNTRUSTED = "untrusted"
 
 
-@dataclass
+# Spotlighting delimiters, built once.
+_TIER_TAGS = {tier: (f"<{tier.value}>\n", f"\n</{tier.value}>") for tier in TrustTier}
+_EXT_PREFIX = "<external_content>\n"
+_EXT_SUFFIX = "\n</external_content>"
+
+
+@dataclass(slots=True)
 class SanitizeResult:
     text: str
     was_truncated: bool = False
     injection_count: int = 0
+    partial_scan: bool = False   # injection_count only covers a capped window
+    rule_counts: dict[str, int] = field(default_factory=dict)   # hits per rule name
 
 
 class Sanitizer:
@@ -77,14 +331,34 @@ class Sanitizer:
     ) -> SanitizeResult:
         """Strip injections from observation text and enforce the entry budget."""
         budget = max_chars if max_chars is not None else self.max_entry_chars
-        cleaned, count = self._strip_injections(text)
+        window = budget * _SCAN_WINDOW_FACTOR
+        if len(text) > window:
+            window = _extend_window(text, window)
+        partial = len(text) > window
+        cleaned, count, rules = _strip_detailed(text[:window] if partial else text)
+        rule_counts = dict(rules)
+        if partial:
+            cleaned, n = _get_unclosed_block().subn("[REDACTED]", cleaned)
+            if n:
+                count += n
+                rule_counts["unclosed_block"] = n
 
         truncated = False
-        if len(cleaned) > budget:
-            cleaned = cleaned[:budget].rstrip() + " … [TRUNCATED]"
+        if partial or len(cleaned) > budget:
+            # Trim trailing whitespace by index so only one slice is copied.
+            end = min(budget, len(cleaned))
+            while end > 0 and cleaned[end - 1].isspace():
+                end -= 1
+            cleaned = cleaned[:end] + " … [TRUNCATED]"
             truncated = True
 
-        return SanitizeResult(text=cleaned, was_truncated=truncated, injection_count=count)
+        return SanitizeResult(
+            text=cleaned,
+            was_truncated=truncated,
+            injection_count=count,
+            partial_scan=partial,
+            rule_counts=rule_counts,
+        )
 
     def spotlight(self, content: str, tier: TrustTier) -> str:
         """Wrap content in tier-specific XML tags for spotlighting.
@@ -96,8 +370,8 @@ class Sanitizer:
             body = content.strip()
         else:
             body, _ = self._strip_injections(content)
-        tag = tier.value
-        return f"<{tag}>\n{body}\n</{tag}>"
+        open_tag, close_tag = _TIER_TAGS[tier]
+        return open_tag + body + close_tag
 
     def wrap_external(self, content: str) -> str:
         """Wrap untrusted external content in delimiters after stripping injections.
@@ -105,17 +379,17 @@ class Sanitizer:
         Preserved for backward compatibility. Equivalent to spotlight(content, TrustTier.UNTRUSTED)
         but uses the legacy <external_content> tag.
         """
-        cleaned, _ = self._strip_injections(content)
-        return f"<external_content>\n{cleaned.strip()}\n</external_content>"
+        cleaned, _ = self._strip_injections(content)  # already stripped
+        return _EXT_PREFIX + cleaned + _EXT_SUFFIX
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
 
     def _strip_injections(self, content: str) -> tuple[str, int]:
-        count = 0
-        for compiled, _ in _COMPILED:
-            new_content, n = compiled.subn("[REDACTED]", content)
-            count += n
-            content = new_content
-        return content.strip(), count
+        return _strip_injections(content)
+
+
+# Shared instance used when Observer/Reflector are built without one. The
+# compiled patterns are module-level, so instances only carry the budget.
+DEFAULT_SANITIZER = Sanitizer()
@@ -5,37 +5,56 @@ from datetime import date
 from agentctx.memory.observation_log import ObservationLog
 
 _BLOCK1_HEADER = "## Observation Log\n\n"
-_BLOCK2_HEADER = "## Current Session\n\n"
+# Block 2 header as lines for "\n".join: heading, blank line, then messages.
+_BLOCK2_LINES = ["## Current Session", ""]
 
 
 class ContextBuilder:
     def __init__(self, observation_log: ObservationLog) -> None:
         self.observation_log = observation_log
+        # (today, observation-log sha256, rendered prefix)
+        self._prefix_cache: tuple[date, str, str] | None = None
 
     def build_prefix(self, today: date | None = None) -> str:
-        """Block 1: stable, cacheable observation log prefix."""
-        entries = self.observation_log.entries()
-        if not entries:
-            return ""
-        rendered = "\n\n".join(e.render(today) for e in entries)
-        return _BLOCK1_HEADER + rendered
+        """Block 1: stable, cacheable observation log prefix.
+
+        Memoized on ``(today, log hash)``; the hash is maintained incrementally
+        by the log, so an unchanged log costs one stat per call.
+        """
+        today = today or date.today()
+        _, log_hash = self.observation_log.snapshot()
+        cached = self._prefix_cache
+        if cached is not None and cached[0] == today and cached[1] == log_hash:
+            return cached[2]
+
+        rendered = self.observation_log.render_all(today)
+        prefix = _BLOCK1_HEADER + rendered if rendered else ""
+        self._prefix_cache = (today, log_hash, prefix)
+        return prefix
 
     def build(self, session_messages: list[dict], today: date | None = None) -> str:
         """Assemble Block 1 (observation log) + Block 2 (current session)."""
-        prefix = self.build_prefix(today)
-        session_text = self._format_session(session_messages)
+        return self.assemble(
+            self.build_prefix(today),
+            [
+                self.session_line(msg.get("role", "unknown"), msg.get("content", ""))
+                for msg in session_messages
+            ],
+        )
 
-        if prefix and session_text:
-            return prefix + "\n\n" + _BLOCK2_HEADER + session_text
-        if prefix:
-            return prefix
-        if session_text:
-            return _BLOCK2_HEADER + session_text
-        return ""
+    @staticmethod
+    def session_line(role: str, content: str) -> str:
+        """One Block 2 line: ``[role]: content``."""
+        return f"[{role}]: {content}"
 
     @staticmethod
-    def _format_session(messages: list[dict]) -> str:
-        return "\n".join(
-            f"[{msg.get('role', 'unknown')}]: {msg.get('content', '')}"
-            for msg in messages
-        )
+    def assemble(prefix: str, session_lines: list[str]) -> str:
+        """``prefix`` followed by Block 2 built from ``session_line()`` lines."""
+        if not session_lines:
+            return prefix
+        # Everything goes through one join, so neither the (potentially
+        # large) prefix nor the session text is copied into an intermediate.
+        parts = [prefix, ""] if prefix else []
+        parts += _BLOCK2_LINES
+        parts += session_lines
+        return "\n".join(parts)
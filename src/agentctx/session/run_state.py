@@ -1,62 +1,234 @@
 from __future__ import annotations
 
-import json
+import contextlib
+import os
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+from agentctx import _json
+from agentctx._io import fsync_dir, read_all, write_all
 
-@dataclass
+
+# With journal=True the snapshot is rewritten once the journal outgrows it
+# by this factor (and on save()/mark_done()).
+_COMPACT_RATIO = 10
+_MIN_COMPACT_BYTES = 64 * 1024
+
+_ZSTD_LEVEL = 3
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError(
+            "The 'zstandard' package is required for compress=True. "
+            "Install it with: pip install agentctx[zstd]"
+        ) from None
+    return zstandard
+
+
+@dataclass(slots=True)
 class StepRecord:
     done: bool
     result: Any = None
 
 
 class RunState:
-    def __init__(self, run_id: str, storage_path: Path) -> None:
+    """Resumable per-run step record, persisted as ``{run_id}.json``.
+
+    Each save rewrites the file atomically (temp file + rename). By default
+    every ``complete()``/``fail()`` saves; with ``flush_interval=N`` step
+    changes are saved every N changes, on ``flush()``, and on
+    ``mark_done()`` — a crash may then lose up to N-1 step updates. Used as
+    a context manager, the state is closed (and so flushed) when the block
+    exits. With ``durable=True`` each save is fsynced before the rename
+    and the directory after it.
+
+    With ``journal=True`` step changes are appended to ``{run_id}.log`` as
+    one JSON line each instead of rewriting the whole snapshot, and the
+    snapshot is only rewritten (and the journal emptied) when the journal
+    grows to ten times its size, on ``save()`` and on ``mark_done()``.
+    Loading always replays a journal left next to the snapshot, whichever
+    mode wrote it.
+
+    With ``compress=True`` the snapshot is zstd-compressed JSON stored as
+    ``{run_id}.json.zst`` (requires the ``zstd`` extra); a run must be
+    resumed with the same ``compress`` setting it was saved with, and a
+    mismatch raises ``ValueError``.
+    """
+
+    def __init__(
+        self,
+        run_id: str,
+        storage_path: Path,
+        flush_interval: int = 1,
+        durable: bool = False,
+        journal: bool = False,
+        compress: bool = False,
+    ) -> None:
         self.run_id = run_id
         self.storage_path = Path(storage_path)
+        # str paths for the os-level calls, built once rather than per save.
+        suffix = ".json.zst" if compress else ".json"
+        self._spath = os.fspath(self.storage_path / f"{run_id}{suffix}")
+        self._tmp_spath = self._spath + ".tmp"
+        self._journal_spath = os.fspath(self.storage_path / f"{run_id}.log")
+        self.flush_interval = flush_interval
+        self.durable = durable
+        self.journal = journal
+        self.compress = compress
+        self._zstd = _zstd() if compress else None
         self._status: str = "in_progress"
         self._steps: dict[str, StepRecord] = {}
+        # Completed step names in _steps order (a dict used as an ordered
+        # set), kept in step with _steps.
+        self._completed: dict[str, None] = {}
+        self._unsaved = 0  # step changes since the last save
+        # Journal lines not yet written, the append descriptor, and the
+        # journal / snapshot sizes that decide when to compact.
+        self._journal_pending: list[bytes] = []
+        self._journal_fd: int | None = None
+        self._journal_bytes = 0
+        self._snapshot_bytes = 0
         self._load_if_exists()
 
+    def __del__(self) -> None:
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def __enter__(self) -> RunState:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
 
-    @property
-    def _path(self) -> Path:
-        return self.storage_path / f"{self.run_id}.json"
+    def _open_creating_dir(self, path: str, flags: int) -> int:
+        """``os.open(path, flags | O_CREAT, 0o600)``, creating the storage
+        directory only when the open reports it missing."""
+        try:
+            return os.open(path, flags | os.O_CREAT, 0o600)
+        except FileNotFoundError:
+            self.storage_path.mkdir(parents=True, exist_ok=True)
+            return os.open(path, flags | os.O_CREAT, 0o600)
+
+    @staticmethod
+    def _read(path: str) -> bytes | None:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except FileNotFoundError:
+            return None
+        try:
+            return read_all(fd)
+        finally:
+            os.close(fd)
 
     def _load_if_exists(self) -> None:
-        if not self._path.exists():
+        raw = self._read(self._spath)
+        if raw is not None:
+            if self._zstd is not None:
+                raw = self._zstd.ZstdDecompressor().decompress(raw)
+            data = _json.loads(raw)
+            self._snapshot_bytes = len(raw)
+            self._status = data.get("status", "in_progress")
+            self._steps = {
+                k: StepRecord(**v) for k, v in data.get("steps", {}).items()
+            }
+            self._reindex_completed()
+        else:
+            # The snapshot saved under the other compress setting would be
+            # ignored here and then diverge from the one this state writes.
+            other = self._spath.removesuffix(".zst") if self.compress else self._spath + ".zst"
+            if os.path.exists(other):
+                raise ValueError(
+                    f"Run {self.run_id!r} was saved with compress={not self.compress}; "
+                    "resume it with the same setting."
+                )
+        self._replay_journal()
+
+    def _replay_journal(self) -> None:
+        raw = self._read(self._journal_spath)
+        if not raw:
             return
-        data = json.loads(self._path.read_text(encoding="utf-8"))
-        self._status = data.get("status", "in_progress")
-        self._steps = {
-            k: StepRecord(**v) for k, v in data.get("steps", {}).items()
-        }
+        self._journal_bytes = len(raw)
+        for line in raw.splitlines():
+            try:
+                delta = _json.loads(line)
+            except ValueError:
+                break  # torn final line from a crash mid-append
+            self._set(delta["step"], delta["done"], delta["result"])
 
     # ------------------------------------------------------------------
     # Step management
     # ------------------------------------------------------------------
 
     def complete(self, step: str, result: Any = None) -> None:
-        self._steps[step] = StepRecord(done=True, result=result)
-        self.save()
+        self._set(step, True, result)
+        self._changed(step, True, result)
 
     def fail(self, step: str, result: Any = None) -> None:
-        self._steps[step] = StepRecord(done=False, result=result)
-        self.save()
+        self._set(step, False, result)
+        self._changed(step, False, result)
+
+    def _set(self, step: str, done: bool, result: Any) -> None:
+        known = step in self._steps
+        self._steps[step] = StepRecord(done=done, result=result)
+        if not done:
+            self._completed.pop(step, None)
+        elif not known:
+            self._completed[step] = None
+        elif step not in self._completed:
+            # A failed step completed again keeps its original position.
+            self._reindex_completed()
+
+    def _reindex_completed(self) -> None:
+        self._completed = dict.fromkeys(k for k, v in self._steps.items() if v.done)
+
+    def _changed(self, step: str, done: bool, result: Any) -> None:
+        if self.journal:
+            self._journal_pending.append(
+                _json.dumps({"step": step, "done": done, "result": result}) + b"\n"
+            )
+        self._unsaved += 1
+        if self._unsaved >= self.flush_interval:
+            self._persist()
+
+    def _persist(self) -> None:
+        if not self.journal:
+            self.save()
+            return
+        if self._journal_fd is None:
+            self._journal_fd = self._open_creating_dir(
+                self._journal_spath, os.O_WRONLY | os.O_APPEND
+            )
+            if self.durable:
+                fsync_dir(self.storage_path)
+        pending, self._journal_pending = self._journal_pending, []
+        write_all(self._journal_fd, pending)
+        if self.durable:
+            os.fsync(self._journal_fd)
+        self._unsaved = 0
+        self._journal_bytes += sum(len(line) for line in pending)
+        threshold = _COMPACT_RATIO * max(self._snapshot_bytes, _MIN_COMPACT_BYTES)
+        if self._journal_bytes > threshold:
+            self.save()
 
     def completed_steps(self) -> list[str]:
-        return [k for k, v in self._steps.items() if v.done]
+        return list(self._completed)
 
     def is_complete(self, step: str) -> bool:
-        return self._steps.get(step, StepRecord(done=False)).done
+        return step in self._completed
 
     def get_result(self, step: str) -> Any:
-        return self._steps.get(step, StepRecord(done=False)).result
+        record = self._steps.get(step)
+        return None if record is None else record.result
 
     # ------------------------------------------------------------------
     # Run-level status
@@ -71,11 +243,47 @@ class RunState:
     # ------------------------------------------------------------------
 
     def save(self) -> None:
-        self.storage_path.mkdir(parents=True, exist_ok=True)
-        self._path.write_text(
-            json.dumps(self.to_dict(), indent=2),
-            encoding="utf-8",
-        )
+        # Write a sibling temp file and rename it over the target, so readers
+        # and resumed runs never see a half-written file.
+        fd = self._open_creating_dir(self._tmp_spath, os.O_WRONLY | os.O_TRUNC)
+        data = _json.dumps(self.to_dict(), indent=self._zstd is None)
+        try:
+            if self._zstd is not None:
+                write_all(fd, [self._zstd.ZstdCompressor(level=_ZSTD_LEVEL).compress(data)])
+            else:
+                write_all(fd, [data])
+            if self.durable:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(self._tmp_spath, self._spath)
+        if self.durable:
+            # The rename itself is only durable once the directory is synced.
+            fsync_dir(self.storage_path)
+        self._unsaved = 0
+        self._snapshot_bytes = len(data)
+        # The snapshot now covers every journalled change. Replaying a
+        # journal that a crash left un-truncated gives the same state.
+        self._journal_pending = []
+        if self._journal_bytes:
+            if self._journal_fd is not None:
+                os.ftruncate(self._journal_fd, 0)
+            else:
+                with contextlib.suppress(FileNotFoundError):
+                    os.truncate(self._journal_spath, 0)
+            self._journal_bytes = 0
+
+    def flush(self) -> None:
+        """Write any step changes that are still pending."""
+        if self._unsaved:
+            self._persist()
+
+    def close(self) -> None:
+        """Flush, then release the journal descriptor (reopened on demand)."""
+        self.flush()
+        if self._journal_fd is not None:
+            os.close(self._journal_fd)
+            self._journal_fd = None
 
     def to_dict(self) -> dict:
         return {
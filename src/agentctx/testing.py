@@ -28,6 +28,9 @@ class FakeLLMAdapter:
         self.calls.append({"messages": messages, "system": system})
         return self.response
 
+    async def acall(self, messages: list[dict], system: str = "") -> str:
+        return self.call(messages, system)
+
     def stream(self, messages: list[dict], system: str = "") -> Iterator[str]:
         self.calls.append({"messages": messages, "system": system})
         yield self.response
@@ -97,8 +97,9 @@ class TestClaudeAdapter:
         import sys
         monkeypatch.setitem(sys.modules, "anthropic", None)
         from agentctx.adapters.claude import ClaudeAdapter
+        adapter = ClaudeAdapter()  # import is deferred to the first call
         with pytest.raises(ImportError, match="anthropic"):
-            ClaudeAdapter()
+            adapter.call([{"role": "user", "content": "hi"}])
 
 # ---------------------------------------------------------------------------
 # GeminiAdapter — mock model injection
@@ -148,3 +149,74 @@ class TestGeminiAdapter:
         model = self._make_mock_model("ok")
         adapter = GeminiAdapter(_model_instance=model)
         assert isinstance(adapter, LLMAdapter)
+
+    def test_single_user_message_without_system(self):
+        from agentctx.adapters.gemini import GeminiAdapter
+        contents = GeminiAdapter._convert_messages([{"role": "user", "content": "hi"}], "")
+        assert contents == [{"role": "user", "parts": ["hi"]}]
+
+    def test_single_user_message_with_system(self):
+        from agentctx.adapters.gemini import GeminiAdapter
+        contents = GeminiAdapter._convert_messages([{"role": "user", "content": "hi"}], "sys")
+        assert contents == [{"role": "user", "parts": ["sys\n\nhi"]}]
+
+    def test_stream_coalesces_small_chunks(self):
+        from agentctx.adapters.gemini import GeminiAdapter
+        model = MagicMock()
+        model.generate_content.return_value = [
+            MagicMock(text=t) for t in ["a", "b", "", "c", "d", "e"]
+        ]
+        adapter = GeminiAdapter(min_chunk_chars=2, _model_instance=model)
+        assert list(adapter.stream([{"role": "user", "content": "hi"}])) == ["ab", "cd", "e"]
+
+    def test_missing_sdk_raises_import_error_on_first_call(self, monkeypatch):
+        import sys
+        monkeypatch.setitem(sys.modules, "google", None)
+        monkeypatch.setitem(sys.modules, "google.generativeai", None)
+        from agentctx.adapters.gemini import GeminiAdapter
+        adapter = GeminiAdapter()
+        with pytest.raises(ImportError, match="google-generativeai"):
+            adapter.call([{"role": "user", "content": "hi"}])
+
+
+# ---------------------------------------------------------------------------
+# coalesce_chunks
+# ---------------------------------------------------------------------------
+
+class TestCoalesceChunks:
+    def test_passthrough_by_default_drops_empty_chunks(self):
+        from agentctx.adapters.base import coalesce_chunks
+        assert list(coalesce_chunks(["a", "", "b"])) == ["a", "b"]
+
+    def test_merges_until_min_chars(self):
+        from agentctx.adapters.base import coalesce_chunks
+        assert list(coalesce_chunks(["ab", "c", "defg", "h"], min_chars=3)) == ["abc", "defg", "h"]
+
+    def test_flush_interval_yields_early(self, monkeypatch):
+        from agentctx.adapters import base
+        clock = iter([0.0, 0.001, 0.5, 0.5, 0.6])
+        monkeypatch.setattr(base.time, "monotonic", lambda: next(clock))
+        chunks = list(base.coalesce_chunks(["a", "b", "c"], min_chars=100, flush_interval_ms=100))
+        assert chunks == ["ab", "c"]
+
+
+class TestGeminiConvertMessages:
+    def test_system_prepended_only_to_first_user_message(self):
+        from agentctx.adapters.gemini import GeminiAdapter
+        messages = [
+            {"role": "assistant", "content": "earlier"},
+            {"role": "user", "content": "q1"},
+            {"role": "user", "content": "q2"},
+        ]
+        contents = GeminiAdapter._convert_messages(messages, "sys")
+        assert contents == [
+            {"role": "model", "parts": ["earlier"]},
+            {"role": "user", "parts": ["sys\n\nq1"]},
+            {"role": "user", "parts": ["q2"]},
+        ]
+
+    def test_input_messages_not_modified(self):
+        from agentctx.adapters.gemini import GeminiAdapter
+        messages = [{"role": "user", "content": "q1"}]
+        GeminiAdapter._convert_messages(messages, "sys")
+        assert messages == [{"role": "user", "content": "q1"}]
@@ -1,3 +1,6 @@
+import dataclasses
+import hashlib
+import multiprocessing
 import stat
 from datetime import date
 from pathlib import Path
@@ -7,6 +10,14 @@ import pytest
 from agentctx.memory.observation_log import ObservationEntry, ObservationLog
 
 
+def _entry(
+    text: str = "Pattern", priority: str = "🟢", event_date: date = date(2026, 2, 23),
+) -> ObservationEntry:
+    return ObservationEntry(
+        priority=priority, observed_on=date(2026, 2, 23), event_date=event_date, text=text,
+    )
+
+
 # ---------------------------------------------------------------------------
 # ObservationEntry unit tests
 # ---------------------------------------------------------------------------
@@ -39,6 +50,17 @@ class TestObservationEntryRelativeLag:
         )
         assert entry.relative_lag(today=date(2026, 2, 23)) == "3_days_ago"
 
+    def test_lag_beyond_table_and_future_dates(self):
+        entry = ObservationEntry(
+            priority="🟡",
+            observed_on=date(2025, 1, 1),
+            event_date=date(2025, 1, 1),
+            text="",
+        )
+        assert entry.relative_lag(today=date(2026, 1, 1)) == "365_days_ago"
+        assert entry.relative_lag(today=date(2026, 1, 2)) == "366_days_ago"
+        assert entry.relative_lag(today=date(2024, 12, 31)) == "-1_days_ago"
+
 
 class TestObservationEntryRender:
     def test_render_includes_relative(self):
@@ -114,11 +136,49 @@ class TestObservationEntrySerialize:
         assert "[EXT]" in entry.serialize()
 
 
+class TestObservationEntryCaching:
+    def test_entries_are_immutable(self):
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            _entry().text = "changed"
+
+    def test_serialize_is_cached(self):
+        entry = _entry()
+        assert entry.serialize() is entry.serialize()
+
+    def test_render_cache_keyed_on_today(self):
+        entry = _entry(event_date=date(2026, 2, 20))
+        assert "relative:3_days_ago" in entry.render(today=date(2026, 2, 23))
+        assert "relative:4_days_ago" in entry.render(today=date(2026, 2, 24))
+
+    def test_render_splices_relative_after_multi_code_point_priority(self):
+        entry = ObservationEntry(
+            priority="⚠️", observed_on=date(2026, 2, 23),
+            event_date=date(2026, 2, 20), text="Pattern", external=True,
+        )
+        assert entry.render(today=date(2026, 2, 23)) == (
+            "⚠️ observed_on:2026-02-23 event_date:2026-02-20 relative:3_days_ago [EXT]\nPattern"
+        )
+
+    def test_caches_ignored_by_equality(self):
+        a, b = _entry(), _entry()
+        a.serialize()
+        assert a == b
+
+
 # ---------------------------------------------------------------------------
 # ObservationLog._parse static method
 # ---------------------------------------------------------------------------
 
 class TestObservationLogParse:
+    def test_make_entry_matches_constructor(self):
+        from agentctx.memory.observation_log import _make_entry
+        args = ("🟡", date(2026, 2, 23), date(2026, 2, 20), "text", True)
+        fast, slow = _make_entry(*args), ObservationEntry(*args)
+        for f in dataclasses.fields(ObservationEntry):
+            assert getattr(fast, f.name) == getattr(slow, f.name), f.name
+        assert fast == slow and hash(fast) == hash(slow)
+        assert fast.render(date(2026, 2, 23)) == slow.render(date(2026, 2, 23))
+
     def test_parse_empty_string(self):
         assert ObservationLog._parse("") == []
 
@@ -230,6 +290,14 @@ class TestObservationLogIO:
         assert entries[0].text == "First"
         assert entries[1].text == "Second"
 
+    def test_first_append_has_no_leading_separator(self, tmp_path):
+        log = ObservationLog(tmp_path / "observations.md")
+        log.append(ObservationEntry(
+            priority="🟢", observed_on=date(2026, 2, 23),
+            event_date=date(2026, 2, 23), text="First",
+        ))
+        assert log.read_raw().startswith("🟢")
+
     def test_overwrite_replaces_all_entries(self, tmp_path):
         log = ObservationLog(tmp_path / "observations.md")
         for i in range(3):
@@ -245,6 +313,20 @@ class TestObservationLogIO:
         assert len(entries) == 1
         assert entries[0].text == "Only this remains"
 
+    def test_overwrite_many_entries_roundtrip(self, tmp_path):
+        # More pieces than a single writev call accepts (IOV_MAX is 1024 on Linux)
+        log = ObservationLog(tmp_path / "observations.md")
+        entries = [
+            ObservationEntry(
+                priority="🟢", observed_on=date(2026, 2, 23),
+                event_date=date(2026, 2, 23), text=f"Entry {i}",
+            )
+            for i in range(1500)
+        ]
+        log.overwrite(entries)
+        assert log.read_raw() == "\n\n".join(e.serialize() for e in entries) + "\n"
+        assert log.token_count_approx() == len(log.read_raw()) // 4
+
     def test_overwrite_with_empty_list_clears_log(self, tmp_path):
         log = ObservationLog(tmp_path / "observations.md")
         log.append(ObservationEntry(
@@ -263,6 +345,274 @@ class TestObservationLogIO:
         assert log.token_count_approx() > 0
 
 
+# ---------------------------------------------------------------------------
+# Incremental hashing
+# ---------------------------------------------------------------------------
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class TestObservationLogHash:
+    def test_hash_of_missing_file_is_empty_hash(self, tmp_path):
+        log = ObservationLog(tmp_path / "observations.md")
+        assert log.current_hash() == _sha256("")
+
+    def test_hash_tracks_appends(self, tmp_path):
+        log = ObservationLog(tmp_path / "observations.md")
+        log.current_hash()
+        for i in range(3):
+            log.append(ObservationEntry(
+                priority="🟢", observed_on=date(2026, 2, 23),
+                event_date=date(2026, 2, 23), text=f"Entry {i}",
+            ))
+            assert log.current_hash() == _sha256(log.read_raw())
+
+    def test_hash_tracks_overwrite(self, tmp_path):
+        log = ObservationLog(tmp_path / "observations.md")
+        log.append(ObservationEntry(
+            priority="🟢", observed_on=date(2026, 2, 23),
+            event_date=date(2026, 2, 23), text="Old",
+        ))
+        log.overwrite([ObservationEntry(
+            priority="🔴", observed_on=date(2026, 2, 23),
+            event_date=date(2026, 2, 23), text="New",
+        )])
+        assert log.current_hash() == _sha256(log.read_raw())
+
+    def test_hash_matches_reread_for_crlf_text(self, tmp_path):
+        log = ObservationLog(tmp_path / "observations.md")
+        log.current_hash()
+        log.append(ObservationEntry(
+            priority="🔴", observed_on=date(2026, 2, 23),
+            event_date=date(2026, 2, 23), text="line one\r\nline two\rthree",
+        ))
+        raw = ObservationLog(log.path).read_raw()
+        assert log.snapshot() == (len(raw), _sha256(raw))
+        assert log.entries() == ObservationLog._parse(raw)
+        log.overwrite([ObservationEntry(
+            priority="🟢", observed_on=date(2026, 2, 23),
+            event_date=date(2026, 2, 23), text="a\r\nb",
+        )])
+        assert log.current_hash() == _sha256(ObservationLog(log.path).read_raw())
+
+    def test_snapshot_returns_length_and_hash(self, tmp_path):
+        log = ObservationLog(tmp_path / "observations.md")
+        log.append(ObservationEntry(
+            priority="🟢", observed_on=date(2026, 2, 23),
+            event_date=date(2026, 2, 23), text="Entry",
+        ))
+        raw = log.read_raw()
+        assert log.snapshot() == (len(raw), _sha256(raw))
+
+    def test_hash_picks_up_out_of_band_writes(self, tmp_path):
+        log = ObservationLog(tmp_path / "observations.md")
+        log.append(ObservationEntry(
+            priority="🟢", observed_on=date(2026, 2, 23),
+            event_date=date(2026, 2, 23), text="Original",
+        ))
+        log.current_hash()
+        log.path.write_text("edited elsewhere", encoding="utf-8")
+        assert log.current_hash() == _sha256("edited elsewhere")
+
+
+# ---------------------------------------------------------------------------
+# Cached state
+# ---------------------------------------------------------------------------
+
+class TestObservationLogCache:
+    def test_entries_cache_extended_on_append(self, tmp_path):
+        log = ObservationLog(tmp_path / "observations.md")
+        log.append(_entry("First"))
+        assert [e.text for e in log.entries()] == ["First"]
+        log.append(_entry("Second"))
+        assert log.entries() == ObservationLog._parse(log.read_raw())
+
+    def test_entries_returns_a_copy(self, tmp_path):
+        log = ObservationLog(tmp_path / "observations.md")
+        log.append(_entry("First"))
+        log.entries().clear()
+        assert len(log.entries()) == 1
+
+    def test_entries_pick_up_out_of_band_writes(self, tmp_path):
+        log = ObservationLog(tmp_path / "observations.md")
+        log.append(_entry("First"))
+        log.entries()
+        log.path.write_text(
+            "🔴 observed_on:2026-02-23 event_date:2026-02-23\nReplaced\n",
+            encoding="utf-8",
+        )
+        assert [e.text for e in log.entries()] == ["Replaced"]
+
+    def test_token_count_tracks_appends_and_overwrite(self, tmp_path):
+        log = ObservationLog(tmp_path / "observations.md")
+        assert log.token_count_approx() == 0
+        log.append(_entry("A" * 400))
+        log.append(_entry("B" * 400))
+        assert log.token_count_approx() == len(log.read_raw()) // 4
+        log.overwrite([_entry("C" * 40)])
+        assert log.token_count_approx() == len(log.read_raw()) // 4
+
+    def test_read_raw_cached_until_file_changes(self, tmp_path, monkeypatch):
+        log = ObservationLog(tmp_path / "observations.md")
+        log.append(_entry("First"))
+        reads = []
+        original = log._read_file
+        monkeypatch.setattr(log, "_read_file", lambda: reads.append(1) or original())
+        raw = log.read_raw()
+        assert log.read_raw() is raw
+        log.entries()
+        assert len(reads) == 1
+        log.append(_entry("Second"))
+        assert "Second" in log.read_raw()
+        log.overwrite([_entry("Third")])
+        assert "Second" not in log.read_raw()
+        assert len(reads) == 3
+
+    def test_same_size_rewrite_with_mtime_restored_detected(self, tmp_path):
+        import os
+        log = ObservationLog(tmp_path / "observations.md")
+        log.append(_entry("approved"))
+        assert [e.text for e in log.entries()] == ["approved"]
+        st = os.stat(log.path)
+        log.path.write_text(log.read_raw().replace("approved", "rejected"), encoding="utf-8")
+        os.utime(log.path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        assert os.stat(log.path).st_size == st.st_size
+        assert [e.text for e in log.entries()] == ["rejected"]
+
+    def test_uncached_read_always_reads_file(self, tmp_path, monkeypatch):
+        log = ObservationLog(tmp_path / "observations.md")
+        log.append(_entry("First"))
+        log.read_raw()
+        reads = []
+        original = log._read_file
+        monkeypatch.setattr(log, "_read_file", lambda: reads.append(1) or original())
+        assert log.read_raw(cached=False) == log.read_raw()
+        log.read_raw(cached=False)
+        assert len(reads) == 2
+
+
+class TestObservationLogRead:
+    def test_read_raw_missing_file(self, tmp_path):
+        assert ObservationLog(tmp_path / "missing.md").read_raw() == ""
+
+    def test_read_raw_translates_crlf(self, tmp_path):
+        path = tmp_path / "observations.md"
+        path.write_bytes(
+            "🔴 observed_on:2026-02-23 event_date:2026-02-23\r\nCRLF entry\r\n".encode()
+        )
+        log = ObservationLog(path)
+        assert log.read_raw() == path.read_text(encoding="utf-8")
+        assert [e.text for e in log.entries()] == ["CRLF entry"]
+
+    def test_render_all_matches_per_entry_render(self, tmp_path):
+        log = ObservationLog(tmp_path / "observations.md")
+        for i, ext in enumerate([False, True, False]):
+            log.append(ObservationEntry(
+                priority="🟡", observed_on=date(2026, 2, 20 + i),
+                event_date=date(2026, 2, 20 + i), text=f"Entry {i}", external=ext,
+            ))
+        today = date(2026, 2, 22)
+        expected = "\n\n".join(e.render(today) for e in ObservationLog(log.path).entries())
+        assert log.render_all(today) == expected
+        assert log.render_all(today) == expected  # served from entry caches
+
+    def test_render_all_empty_log(self, tmp_path):
+        assert ObservationLog(tmp_path / "observations.md").render_all(date(2026, 2, 22)) == ""
+
+
+# ---------------------------------------------------------------------------
+# Append descriptor
+# ---------------------------------------------------------------------------
+
+class TestObservationLogDescriptor:
+    def test_descriptor_reused_across_appends(self, tmp_path):
+        log = ObservationLog(tmp_path / "observations.md")
+        log.append(_entry("First"))
+        fd = log._fd
+        log.append(_entry("Second"))
+        assert log._fd == fd
+
+    def test_append_after_file_deleted_recreates_it(self, tmp_path):
+        log = ObservationLog(tmp_path / "observations.md")
+        log.append(_entry("First"))
+        log.path.unlink()
+        log.append(_entry("Second"))
+        assert [e.text for e in log.entries()] == ["Second"]
+
+    def test_sync_and_close(self, tmp_path):
+        log = ObservationLog(tmp_path / "observations.md")
+        log.sync()  # no descriptor yet — must not raise
+        log.append(_entry("First"))
+        log.sync()
+        log.close()
+        assert log._fd is None
+        log.append(_entry("Second"))
+        assert len(log.entries()) == 2
+
+    def test_append_many_matches_repeated_append(self, tmp_path):
+        one = ObservationLog(tmp_path / "one.md")
+        many = ObservationLog(tmp_path / "many.md")
+        one.append(_entry("First"))
+        many.append(_entry("First"))
+        for text in ("Second", "Third"):
+            one.append(_entry(text))
+        many.entries()  # warm the cache so it is extended in place
+        many.append_many([_entry("Second"), _entry("Third")])
+        assert many.read_raw() == one.read_raw()
+        assert many.entries() == one.entries()
+        assert many.current_hash() == ObservationLog(many.path).current_hash()
+
+    def test_append_many_empty_is_noop(self, tmp_path):
+        log = ObservationLog(tmp_path / "observations.md")
+        log.append_many([])
+        assert not log.path.exists()
+
+    def test_append_after_overwrite_goes_to_new_file(self, tmp_path):
+        log = ObservationLog(tmp_path / "observations.md")
+        log.append(_entry("Old"))
+        log.overwrite([_entry("Consolidated")])
+        log.append(_entry("New"))
+        assert [e.text for e in log.entries()] == ["Consolidated", "New"]
+        assert not (tmp_path / "observations.md.tmp").exists()
+
+    def test_writes_serialised_through_lock_sidecar(self, tmp_path):
+        log = ObservationLog(tmp_path / "observations.md")
+        log.append(_entry("First"))
+        assert (tmp_path / "observations.md.lock").exists()
+        log.close()
+        assert log._lock_fd is None
+
+    @pytest.mark.skipif(
+        "fork" not in multiprocessing.get_all_start_methods(), reason="needs fork"
+    )
+    def test_concurrent_appends_and_overwrite_keep_log_parseable(self, tmp_path):
+        path = tmp_path / "observations.md"
+
+        def work(worker: int) -> None:
+            log = ObservationLog(path)
+            for i in range(20):
+                log.append_many([_entry(f"w{worker}-{i}-{j}") for j in range(3)])
+                if worker == 0 and i == 10:
+                    log.overwrite([_entry("Consolidated")])
+
+        ctx = multiprocessing.get_context("fork")
+        procs = [ctx.Process(target=work, args=(w,)) for w in range(3)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+        raw = ObservationLog(path).read_raw()
+        assert len(ObservationLog(path).entries()) == raw.count("observed_on:")
+
+    def test_overwrite_preserves_file_mode(self, tmp_path):
+        log = ObservationLog(tmp_path / "observations.md")
+        log.append(_entry("Old"))
+        log.path.chmod(0o600)
+        log.overwrite([_entry("Consolidated")])
+        assert stat.S_IMODE(log.path.stat().st_mode) == 0o600
+
+
 # ---------------------------------------------------------------------------
 # File permissions
 # ---------------------------------------------------------------------------
@@ -4,7 +4,7 @@ import pytest
 
 from agentctx.memory.observation_log import ObservationLog
 from agentctx.memory.observer import Observer
-from agentctx.security.sanitizer import Sanitizer
+from agentctx.security.sanitizer import DEFAULT_SANITIZER, Sanitizer
 
 
 # ---------------------------------------------------------------------------
@@ -30,6 +30,13 @@ class TestObserverCompress:
         assert result == []
         assert log.entries() == []
 
+    def test_sanitizer_defaults_to_shared_instance(self, tmp_path):
+        from agentctx.testing import FakeLLMAdapter
+        log = ObservationLog(tmp_path / "observations.md")
+        observer = Observer(FakeLLMAdapter("🟢 Done"), log)
+        assert observer.sanitizer is DEFAULT_SANITIZER
+        assert [e.text for e in observer.compress([{"role": "user", "content": "x"}])] == ["Done"]
+
     def test_calls_llm_with_formatted_messages(self, tmp_path):
         from agentctx.testing import FakeLLMAdapter
         fake = FakeLLMAdapter("🟢 Done")
@@ -45,6 +52,14 @@ class TestObserverCompress:
         assert "[user]: Hello" in call_content
         assert "[assistant]: World" in call_content
 
+    def test_compress_transcript_sends_transcript_as_is(self, tmp_path):
+        from agentctx.testing import FakeLLMAdapter
+        fake = FakeLLMAdapter("🟢 Done")
+        observer = Observer(fake, ObservationLog(tmp_path / "observations.md"))
+        entries = observer.compress_transcript("[user]: Hello")
+        assert fake.calls[0]["messages"][0]["content"] == "[user]: Hello"
+        assert [e.text for e in entries] == ["Done"]
+
     def test_system_prompt_passed_to_llm(self, tmp_path):
         from agentctx.testing import FakeLLMAdapter
         fake = FakeLLMAdapter("🟢 Done")
@@ -130,6 +145,12 @@ class TestObserverParsing:
         entries = observer.compress([{"role": "user", "content": "test"}])
         assert len(entries) == 2
 
+    def test_crlf_and_indented_lines(self, tmp_path):
+        response = "  🔴 First  \r\nnoise\r\n\t🟢: Second\r\n"
+        observer, log = make_observer(tmp_path, response)
+        entries = observer.compress([{"role": "user", "content": "test"}])
+        assert [(e.priority, e.text) for e in entries] == [("🔴", "First"), ("🟢", "Second")]
+
 
 # ---------------------------------------------------------------------------
 # Sanitizer integration
@@ -149,3 +170,72 @@ class TestObserverSanitization:
         observer, log = make_observer(tmp_path, response)
         entries = observer.compress([{"role": "user", "content": "test"}])
         assert "Ignore previous instructions" not in entries[0].text
+
+
+# ---------------------------------------------------------------------------
+# acompress() / compress_batch()
+# ---------------------------------------------------------------------------
+
+class TestObserverAsync:
+    def test_acompress_matches_compress(self, tmp_path):
+        import asyncio
+        observer, log = make_observer(tmp_path, "🔴 Upload failed")
+        entries = asyncio.run(observer.acompress([{"role": "user", "content": "test"}]))
+        assert [e.text for e in entries] == ["Upload failed"]
+        assert log.entries() == entries
+        assert "[user]: test" in observer.llm.calls[0]["messages"][0]["content"]
+
+    def test_acompress_empty_messages(self, tmp_path):
+        import asyncio
+        observer, _ = make_observer(tmp_path, "🟢 Done")
+        assert asyncio.run(observer.acompress([])) == []
+        assert observer.llm.calls == []
+
+    def test_compress_batch_preserves_batch_order(self, tmp_path):
+        import asyncio
+
+        class EchoLLM:
+            async def acall(self, messages, system=""):
+                content = messages[0]["content"]
+                await asyncio.sleep(0.01 if "first" in content else 0)
+                return f"🟢 {content}"
+
+        log = ObservationLog(tmp_path / "observations.md")
+        observer = Observer(EchoLLM(), log, Sanitizer())
+        batches = [
+            [{"role": "user", "content": "first"}],
+            [],
+            [{"role": "user", "content": "second"}],
+        ]
+        results = asyncio.run(observer.compress_batch(batches))
+        assert [[e.text for e in r] for r in results] == [["[user]: first"], [], ["[user]: second"]]
+        assert [e.text for e in log.entries()] == ["[user]: first", "[user]: second"]
+
+    def test_compress_batch_respects_concurrency(self, tmp_path):
+        import asyncio
+        in_flight = peak = 0
+
+        class SlowLLM:
+            async def acall(self, messages, system=""):
+                nonlocal in_flight, peak
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.005)
+                in_flight -= 1
+                return "🟢 ok"
+
+        observer = Observer(SlowLLM(), ObservationLog(tmp_path / "o.md"), Sanitizer())
+        batches = [[{"role": "user", "content": str(i)}] for i in range(6)]
+        asyncio.run(observer.compress_batch(batches, concurrency=2))
+        assert peak == 2
+
+    def test_sync_only_adapter_runs_in_thread(self, tmp_path):
+        import asyncio
+
+        class SyncLLM:
+            def call(self, messages, system=""):
+                return "🟡 From thread"
+
+        observer = Observer(SyncLLM(), ObservationLog(tmp_path / "o.md"), Sanitizer())
+        entries = asyncio.run(observer.acompress([{"role": "user", "content": "x"}]))
+        assert entries[0].text == "From thread"
@@ -102,3 +102,24 @@ class TestReflectorReflect:
         reflector, log = make_reflector(tmp_path, llm_response)
         seed_log(log)
         assert reflector.reflect() is True
+
+
+# ---------------------------------------------------------------------------
+# areflect()
+# ---------------------------------------------------------------------------
+
+class TestReflectorAsync:
+    def test_areflect_rewrites_log(self, tmp_path):
+        import asyncio
+        reflector, log = make_reflector(
+            tmp_path, "🟢 observed_on:2026-02-23 event_date:2026-02-23\nConsolidated"
+        )
+        seed_log(log, n=3)
+        assert asyncio.run(reflector.areflect()) is True
+        assert [e.text for e in log.entries()] == ["Consolidated"]
+
+    def test_areflect_empty_log_skips_llm(self, tmp_path):
+        import asyncio
+        reflector, _ = make_reflector(tmp_path, "anything")
+        assert asyncio.run(reflector.areflect()) is False
+        assert reflector.llm.calls == []
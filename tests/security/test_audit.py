@@ -1,4 +1,6 @@
 import hashlib
+import multiprocessing
+from datetime import datetime, timezone
 
 import pytest
 
@@ -27,6 +29,18 @@ class TestAuditLogHashing:
         assert isinstance(h, str)
         assert len(h) == 64  # SHA-256 hex digest length
 
+    def test_bytes_and_str_hash_identically(self):
+        assert AuditLog.hash_content("héllo".encode("utf-8")) == AuditLog.hash_content("héllo")
+
+    def test_incremental_matches_full_hash(self):
+        hasher, digest = AuditLog.hash_incremental(None, "first ")
+        assert digest == AuditLog.hash_content("first ")
+        extended, digest = AuditLog.hash_incremental(hasher, b"second")
+        assert digest == AuditLog.hash_content("first second")
+        # The previous hasher is left untouched.
+        assert hasher.hexdigest() == AuditLog.hash_content("first ")
+        assert extended is not hasher
+
 
 # ---------------------------------------------------------------------------
 # Empty / missing state
@@ -93,6 +107,43 @@ class TestAuditLogAppend:
         assert entries[0].sha256 == AuditLog.hash_content("v1")
         assert entries[2].sha256 == AuditLog.hash_content("v3")
 
+    def test_record_uses_given_delta_and_hash(self, tmp_path):
+        log = AuditLog(tmp_path / "audit.jsonl")
+        digest = AuditLog.hash_content("content")
+        entry = log.record("manual", char_delta=7, sha256=digest)
+        assert entry.char_delta == 7
+        assert log.last_hash() == digest
+
+    def test_timestamp_is_utc_isoformat(self, tmp_path):
+        log = AuditLog(tmp_path / "audit.jsonl")
+        before = datetime.now(timezone.utc)
+        ts = datetime.fromisoformat(log.append("observer", "", "v1").timestamp)
+        assert ts.tzinfo == timezone.utc
+        assert before <= ts <= datetime.now(timezone.utc)
+
+    def test_timestamp_whole_second_has_no_fraction(self, tmp_path, monkeypatch):
+        from agentctx.security import audit
+        monkeypatch.setattr(audit.time, "time_ns", lambda: 1_700_000_000_000_000_000)
+        log = AuditLog(tmp_path / "audit.jsonl")
+        assert log._timestamp() == "2023-11-14T22:13:20+00:00"
+
+    def test_append_digest_matches_full_hash_as_content_changes(self, tmp_path):
+        log = AuditLog(tmp_path / "audit.jsonl")
+        steps = ["", "a", "ab", "abé", "xyz", "xyz", "xyz🟢", "xy"]
+        for previous, new in zip(steps, steps[1:]):
+            assert log.append("observer", previous, new).sha256 == AuditLog.hash_content(new)
+        # A caller whose "previous" is not the last appended content.
+        assert log.append("manual", "other", "other+").sha256 == AuditLog.hash_content("other+")
+
+    def test_reads_lines_written_by_stdlib_json(self, tmp_path):
+        import json
+        path = tmp_path / "audit.jsonl"
+        old = {"timestamp": "t", "source": "manual", "char_delta": 1, "sha256": "a"}
+        path.write_text(json.dumps(old) + "\n", encoding="utf-8")
+        log = AuditLog(path)
+        log.record("réflecteur", char_delta=2, sha256="b")
+        assert [e.source for e in log.all_entries()] == ["manual", "réflecteur"]
+        assert AuditLog(path).last_entry().source == "réflecteur"
 
 # ---------------------------------------------------------------------------
 # last_entry / last_hash
@@ -112,6 +163,32 @@ class TestAuditLogLastEntry:
         log.append("observer", "", "content")
         assert log.last_hash() == AuditLog.hash_content("content")
 
+    def test_last_entry_spanning_multiple_read_blocks(self, tmp_path):
+        log = AuditLog(tmp_path / "audit.jsonl")
+        log.append("observer", "", "v1")
+        log.record("x" * 10_000, char_delta=1, sha256="abc")
+        assert AuditLog(log.path).last_entry().source == "x" * 10_000
+
+    def test_last_entry_ignores_trailing_blank_lines(self, tmp_path):
+        log = AuditLog(tmp_path / "audit.jsonl")
+        log.append("observer", "", "v1")
+        with log.path.open("a") as f:
+            f.write("\n\n")
+        assert AuditLog(log.path).last_hash() == AuditLog.hash_content("v1")
+
+    def test_last_entry_skips_whitespace_longer_than_a_block(self, tmp_path):
+        log = AuditLog(tmp_path / "audit.jsonl")
+        log.append("observer", "", "v1")
+        with log.path.open("a") as f:
+            f.write("\n" * 10_000)
+        assert AuditLog(log.path).last_hash() == AuditLog.hash_content("v1")
+
+    def test_last_entry_sees_writes_from_another_instance(self, tmp_path):
+        first = AuditLog(tmp_path / "audit.jsonl")
+        first.append("observer", "", "v1")
+        assert first.last_hash() == AuditLog.hash_content("v1")
+        AuditLog(tmp_path / "audit.jsonl").append("reflector", "v1", "v22")
+        assert first.last_hash() == AuditLog.hash_content("v22")
 
 # ---------------------------------------------------------------------------
 # Verification
@@ -134,3 +211,77 @@ class TestAuditLogVerify:
         log.append("reflector", "v1", "v2")
         assert log.verify("v2") is True
         assert log.verify("v1") is False
+
+
+# ---------------------------------------------------------------------------
+# Batched writes
+# ---------------------------------------------------------------------------
+
+class TestAuditLogBatching:
+    def test_default_batch_size_writes_through(self, tmp_path):
+        log = AuditLog(tmp_path / "audit.jsonl")
+        log.append("observer", "", "v1")
+        assert len(log.path.read_text().splitlines()) == 1
+
+    def test_pending_entries_not_written_until_flush(self, tmp_path):
+        log = AuditLog(tmp_path / "audit.jsonl", batch_size=10)
+        log.append("observer", "", "v1")
+        log.append("reflector", "v1", "v2")
+        assert not log.path.exists()
+        log.flush()
+        assert len(log.path.read_text().splitlines()) == 2
+
+    def test_batch_flushes_when_full(self, tmp_path):
+        log = AuditLog(tmp_path / "audit.jsonl", batch_size=2)
+        log.append("observer", "", "v1")
+        log.append("observer", "v1", "v2")
+        assert len(log.path.read_text().splitlines()) == 2
+
+    def test_reads_include_pending_entries(self, tmp_path):
+        log = AuditLog(tmp_path / "audit.jsonl", batch_size=10)
+        log.append("observer", "", "v1")
+        assert log.last_hash() == AuditLog.hash_content("v1")
+
+    def test_close_flushes_pending(self, tmp_path):
+        log = AuditLog(tmp_path / "audit.jsonl", batch_size=10)
+        log.append("observer", "", "v1")
+        log.close()
+        assert len(AuditLog(tmp_path / "audit.jsonl").all_entries()) == 1
+
+    def test_durable_flush(self, tmp_path):
+        log = AuditLog(tmp_path / "audit.jsonl", durable=True)
+        log.append("observer", "", "v1")
+        assert log.verify("v1") is True
+
+    def test_sync_flushes_pending(self, tmp_path):
+        log = AuditLog(tmp_path / "audit.jsonl", batch_size=10)
+        log.append("observer", "", "v1")
+        log.sync()
+        assert len(AuditLog(tmp_path / "audit.jsonl").all_entries()) == 1
+
+
+# ---------------------------------------------------------------------------
+# Multi-process writers
+# ---------------------------------------------------------------------------
+
+def _append_many(path, worker: int, count: int) -> None:
+    log = AuditLog(path, batch_size=7)
+    for i in range(count):
+        log.record(f"worker-{worker}-" + "x" * 2_000, char_delta=i, sha256="0" * 64)
+    log.close()
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(), reason="needs fork"
+)
+class TestAuditLogConcurrency:
+    def test_concurrent_writers_never_interleave_lines(self, tmp_path):
+        path = tmp_path / "audit.jsonl"
+        ctx = multiprocessing.get_context("fork")
+        procs = [ctx.Process(target=_append_many, args=(path, w, 50)) for w in range(4)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+        entries = AuditLog(path).all_entries()  # every line parses
+        assert len(entries) == 200
@@ -63,6 +63,28 @@ class TestContextBuilderPrefix:
         prefix = builder.build_prefix(today=date(2026, 2, 23))
         assert prefix.startswith("## Observation Log")
 
+    def test_prefix_cached_while_log_unchanged(self, log_with_two_entries, monkeypatch):
+        builder = ContextBuilder(log_with_two_entries)
+        first = builder.build_prefix(today=date(2026, 2, 23))
+        monkeypatch.setattr(
+            log_with_two_entries, "render_all", lambda today: pytest.fail("re-rendered")
+        )
+        assert builder.build_prefix(today=date(2026, 2, 23)) is first
+
+    def test_prefix_rebuilt_after_append(self, log_with_two_entries):
+        builder = ContextBuilder(log_with_two_entries)
+        builder.build_prefix(today=date(2026, 2, 23))
+        log_with_two_entries.append(ObservationEntry(
+            priority="🟡", observed_on=date(2026, 2, 23),
+            event_date=date(2026, 2, 23), text="New entry",
+        ))
+        assert "New entry" in builder.build_prefix(today=date(2026, 2, 23))
+
+    def test_prefix_rebuilt_for_new_day(self, log_with_two_entries):
+        builder = ContextBuilder(log_with_two_entries)
+        builder.build_prefix(today=date(2026, 2, 23))
+        assert "relative:2_days_ago" in builder.build_prefix(today=date(2026, 2, 24))
+
 
 # ---------------------------------------------------------------------------
 # build — combining Block 1 + Block 2
@@ -135,3 +157,11 @@ class TestContextBuilderFull:
         second_pos = result.index("Second")
         third_pos = result.index("Third")
         assert first_pos < second_pos < third_pos
+
+    def test_assemble_matches_build(self, log_with_two_entries):
+        builder = ContextBuilder(log_with_two_entries)
+        today = date(2026, 2, 23)
+        lines = [ContextBuilder.session_line("user", "Hi")]
+        assert ContextBuilder.assemble(builder.build_prefix(today), lines) == builder.build(
+            [{"role": "user", "content": "Hi"}], today=today
+        )
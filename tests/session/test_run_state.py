@@ -70,6 +70,32 @@ class TestRunStateStepMutations:
         state.complete("summarize")
         assert set(state.completed_steps()) == {"parse", "research", "summarize"}
 
+    def test_fail_after_complete_removes_step(self, tmp_path):
+        state = RunState("run-001", tmp_path)
+        state.complete("parse")
+        state.fail("parse")
+        assert not state.is_complete("parse")
+        assert state.completed_steps() == []
+
+    def test_completed_steps_survive_reload(self, tmp_path):
+        state = RunState("run-001", tmp_path)
+        state.complete("a")
+        state.fail("b")
+        state.complete("c")
+        reloaded = RunState("run-001", tmp_path)
+        assert reloaded.completed_steps() == ["a", "c"]
+        assert reloaded.is_complete("c") and not reloaded.is_complete("b")
+
+    @pytest.mark.parametrize("journal", [False, True])
+    def test_recompleted_step_order_matches_after_reload(self, tmp_path, journal):
+        state = RunState("run-001", tmp_path, journal=journal)
+        state.complete("a")
+        state.complete("b")
+        state.fail("a")
+        state.complete("a")
+        assert state.completed_steps() == ["a", "b"]
+        assert RunState("run-001", tmp_path).completed_steps() == ["a", "b"]
+
     def test_complete_result_with_list(self, tmp_path):
         state = RunState("run-001", tmp_path)
         state.complete("gather", result=[1, 2, 3])
@@ -136,3 +162,210 @@ class TestRunStatePersistence:
         state = RunState("run-001", nested)
         state.complete("parse")
         assert (nested / "run-001.json").exists()
+
+    def test_storage_dir_recreated_if_removed_between_saves(self, tmp_path):
+        import shutil
+        runs = tmp_path / "runs"
+        state = RunState("run-001", runs)
+        state.complete("parse")
+        shutil.rmtree(runs)
+        state.complete("summarize")
+        assert RunState("run-001", runs).completed_steps() == ["parse", "summarize"]
+
+    def test_save_skips_mkdir_when_dir_exists(self, tmp_path, monkeypatch):
+        from pathlib import Path
+        state = RunState("run-001", tmp_path)
+        calls = []
+        monkeypatch.setattr(Path, "mkdir", lambda *a, **k: calls.append(a))
+        state.complete("parse")
+        state.complete("summarize")
+        assert calls == []
+
+    def test_result_with_non_string_keys_still_saved(self, tmp_path):
+        state = RunState("run-001", tmp_path)
+        state.complete("parse", result={1: "one"})
+        assert RunState("run-001", tmp_path).get_result("parse") == {"1": "one"}
+
+    def test_round_trip_without_orjson(self, tmp_path, monkeypatch):
+        from agentctx import _json
+        monkeypatch.setattr(_json, "orjson", None)
+        state = RunState("run-001", tmp_path)
+        state.complete("parse", result=["é", 2])
+        assert RunState("run-001", tmp_path).get_result("parse") == ["é", 2]
+
+    def test_save_leaves_no_temp_file(self, tmp_path):
+        state = RunState("run-001", tmp_path)
+        state.complete("parse")
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["run-001.json"]
+
+
+# ---------------------------------------------------------------------------
+# Batched saves (flush_interval)
+# ---------------------------------------------------------------------------
+
+class TestRunStateFlushInterval:
+    def test_changes_buffered_until_interval(self, tmp_path):
+        state = RunState("run-001", tmp_path, flush_interval=3)
+        state.complete("a")
+        state.fail("b")
+        assert not (tmp_path / "run-001.json").exists()
+        state.complete("c")
+        assert RunState("run-001", tmp_path).completed_steps() == ["a", "c"]
+
+    def test_flush_writes_pending_changes(self, tmp_path):
+        state = RunState("run-001", tmp_path, flush_interval=10)
+        state.complete("a")
+        state.flush()
+        assert RunState("run-001", tmp_path).is_complete("a")
+
+    def test_mark_done_writes_pending_changes(self, tmp_path):
+        state = RunState("run-001", tmp_path, flush_interval=10)
+        state.complete("a")
+        state.mark_done()
+        reloaded = RunState("run-001", tmp_path)
+        assert reloaded.is_complete("a")
+        assert reloaded._status == "done"
+
+    def test_context_manager_flushes_on_exit(self, tmp_path):
+        with RunState("run-001", tmp_path, flush_interval=10) as state:
+            state.complete("a")
+            state.complete("b")
+            assert not (tmp_path / "run-001.json").exists()
+        assert RunState("run-001", tmp_path).completed_steps() == ["a", "b"]
+
+    def test_context_manager_flushes_when_block_raises(self, tmp_path):
+        with pytest.raises(RuntimeError):
+            with RunState("run-001", tmp_path, flush_interval=10) as state:
+                state.complete("a")
+                raise RuntimeError("step failed")
+        assert RunState("run-001", tmp_path).is_complete("a")
+
+
+# ---------------------------------------------------------------------------
+# Append-only journal (journal=True)
+# ---------------------------------------------------------------------------
+
+class TestRunStateJournal:
+    def test_changes_appended_to_journal_not_snapshot(self, tmp_path):
+        state = RunState("run-001", tmp_path, journal=True)
+        state.complete("a", result=1)
+        state.fail("b", result="timeout")
+        assert not (tmp_path / "run-001.json").exists()
+        lines = (tmp_path / "run-001.log").read_text().splitlines()
+        assert [json.loads(line)["step"] for line in lines] == ["a", "b"]
+
+    def test_reload_replays_journal_over_snapshot(self, tmp_path):
+        state = RunState("run-001", tmp_path, journal=True)
+        state.complete("a")
+        state.save()
+        state.complete("b", result=2)
+        state.fail("a")
+        reloaded = RunState("run-001", tmp_path)
+        assert reloaded.completed_steps() == ["b"]
+        assert reloaded.get_result("b") == 2
+
+    def test_mark_done_compacts_journal(self, tmp_path):
+        state = RunState("run-001", tmp_path, journal=True)
+        state.complete("a")
+        state.mark_done()
+        assert (tmp_path / "run-001.log").read_bytes() == b""
+        reloaded = RunState("run-001", tmp_path)
+        assert reloaded._status == "done" and reloaded.is_complete("a")
+
+    def test_journal_compacted_once_it_outgrows_snapshot(self, tmp_path, monkeypatch):
+        from agentctx.session import run_state
+        monkeypatch.setattr(run_state, "_MIN_COMPACT_BYTES", 10)
+        state = RunState("run-001", tmp_path, journal=True)
+        for i in range(20):
+            state.complete(f"step-{i}")
+        assert (tmp_path / "run-001.json").exists()
+        assert (tmp_path / "run-001.log").stat().st_size < 10 * 10 * 20
+        assert RunState("run-001", tmp_path).completed_steps() == [f"step-{i}" for i in range(20)]
+
+    def test_torn_final_line_ignored(self, tmp_path):
+        state = RunState("run-001", tmp_path, journal=True)
+        state.complete("a")
+        with (tmp_path / "run-001.log").open("ab") as f:
+            f.write(b'{"step": "b", "do')
+        assert RunState("run-001", tmp_path).completed_steps() == ["a"]
+
+    def test_snapshot_mode_save_truncates_leftover_journal(self, tmp_path):
+        RunState("run-001", tmp_path, journal=True).complete("a")
+        state = RunState("run-001", tmp_path)
+        state.complete("b")
+        assert (tmp_path / "run-001.log").read_bytes() == b""
+        assert RunState("run-001", tmp_path).completed_steps() == ["a", "b"]
+
+    def test_journal_descriptor_kept_open_until_close(self, tmp_path):
+        state = RunState("run-001", tmp_path, journal=True)
+        state.complete("a")
+        fd = state._journal_fd
+        state.complete("b")
+        assert state._journal_fd == fd
+        state.close()
+        assert state._journal_fd is None
+        state.complete("c")  # reopens on demand
+        assert RunState("run-001", tmp_path).completed_steps() == ["a", "b", "c"]
+
+    def test_flush_interval_batches_journal_writes(self, tmp_path):
+        state = RunState("run-001", tmp_path, journal=True, flush_interval=3)
+        state.complete("a")
+        state.complete("b")
+        assert not (tmp_path / "run-001.log").exists()
+        state.flush()
+        assert RunState("run-001", tmp_path).completed_steps() == ["a", "b"]
+
+
+# ---------------------------------------------------------------------------
+# Durability
+# ---------------------------------------------------------------------------
+
+class TestRunStateDurable:
+    def test_fsync_only_when_durable(self, tmp_path, monkeypatch):
+        import os
+        synced = []
+        monkeypatch.setattr(os, "fsync", synced.append)
+        RunState("run-001", tmp_path).complete("a")
+        assert synced == []
+        RunState("run-002", tmp_path, durable=True).complete("a")
+        assert len(synced) == 2  # the temp file, then the directory
+
+    def test_durable_state_round_trips(self, tmp_path):
+        RunState("run-001", tmp_path, durable=True).complete("a", result=1)
+        assert RunState("run-001", tmp_path).get_result("a") == 1
+
+
+# ---------------------------------------------------------------------------
+# Compressed snapshots (compress=True)
+# ---------------------------------------------------------------------------
+
+class TestRunStateCompressed:
+    def test_missing_zstandard_raises_helpful_error(self, tmp_path, monkeypatch):
+        import sys
+        monkeypatch.setitem(sys.modules, "zstandard", None)
+        with pytest.raises(ImportError, match="agentctx\\[zstd\\]"):
+            RunState("run-001", tmp_path, compress=True)
+
+    def test_compressed_snapshot_round_trips(self, tmp_path):
+        zstandard = pytest.importorskip("zstandard")
+        state = RunState("run-001", tmp_path, compress=True)
+        state.complete("a", result=["x"] * 100)
+        assert not (tmp_path / "run-001.json").exists()
+        raw = (tmp_path / "run-001.json.zst").read_bytes()
+        data = json.loads(zstandard.ZstdDecompressor().decompress(raw))
+        assert data["steps"]["a"]["result"] == ["x"] * 100
+        reloaded = RunState("run-001", tmp_path, compress=True)
+        assert reloaded.get_result("a") == ["x"] * 100
+
+    def test_resume_with_compress_off_rejects_compressed_snapshot(self, tmp_path):
+        (tmp_path / "run-001.json.zst").write_bytes(b"")
+        with pytest.raises(ValueError, match="compress=True"):
+            RunState("run-001", tmp_path)
+        assert not (tmp_path / "run-001.json").exists()
+
+    def test_resume_with_compress_on_rejects_plain_snapshot(self, tmp_path):
+        pytest.importorskip("zstandard")
+        RunState("run-001", tmp_path).complete("a")
+        with pytest.raises(ValueError, match="compress=False"):
+            RunState("run-001", tmp_path, compress=True)
+        assert not (tmp_path / "run-001.json.zst").exists()
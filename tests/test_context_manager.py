@@ -32,7 +32,12 @@ class TestContextManagerInit:
 
     def test_session_starts_empty(self, tmp_path):
         ctx = make_ctx(tmp_path)
-        assert ctx._session_messages == []
+        assert ctx._session_lines == []
+
+    def test_construction_touches_no_files(self, tmp_path):
+        # The logs open their files on first read/write, not in __init__.
+        make_ctx(tmp_path)
+        assert list(tmp_path.iterdir()) == []
 
 
 # ---------------------------------------------------------------------------
@@ -72,6 +77,24 @@ class TestContextManagerBuildPrefix:
         ctx.observe("🟢 Done")
         assert "Task Anchor" not in ctx.build_prefix()
 
+    def test_prefix_reused_while_log_unchanged(self, tmp_path):
+        ctx = make_ctx(tmp_path)
+        ctx.observe("🟢 Done")
+        first = ctx.build_prefix(today=date(2026, 2, 23))
+        assert ctx.build_prefix(today=date(2026, 2, 23)) is first
+
+    def test_prefix_rebuilt_after_new_observation(self, tmp_path):
+        ctx = make_ctx(tmp_path)
+        ctx.observe("🟢 First")
+        ctx.build_prefix(today=date(2026, 2, 23))
+        ctx.observe("🟢 Second")
+        assert "Second" in ctx.build_prefix(today=date(2026, 2, 23))
+
+    def test_prefix_rebuilt_for_a_different_day(self, tmp_path):
+        ctx = make_ctx(tmp_path)
+        ctx.observe("🟢 Done", event_date="2026-02-22")
+        assert "relative:1_day_ago" in ctx.build_prefix(today=date(2026, 2, 23))
+        assert "relative:2_days_ago" in ctx.build_prefix(today=date(2026, 2, 24))
 
 # ---------------------------------------------------------------------------
 # observe()
@@ -98,6 +121,12 @@ class TestContextManagerObserve:
         ctx.observe("🟡 Cluster pattern detected")
         assert ctx._observation_log.entries()[0].priority == "🟡"
 
+    def test_observe_strips_marker_separators_and_whitespace(self, tmp_path):
+        ctx = make_ctx(tmp_path)
+        ctx.observe("🔴 : - \n Disk full  \n")
+        entry = ctx._observation_log.entries()[0]
+        assert (entry.priority, entry.text) == ("🔴", "Disk full")
+
     def test_observe_with_explicit_event_date(self, tmp_path):
         ctx = make_ctx(tmp_path)
         ctx.observe("Old event", event_date="2026-02-01")
@@ -114,6 +143,14 @@ class TestContextManagerObserve:
         ctx.observe("Something happened")
         assert ctx._audit_log.last_entry().source == "manual"
 
+    def test_observe_audit_records_char_delta(self, tmp_path):
+        ctx = make_ctx(tmp_path)
+        ctx.observe("Something happened")
+        before = len(ctx._observation_log.read_raw())
+        ctx.observe("Something else happened")
+        after = len(ctx._observation_log.read_raw())
+        assert ctx._audit_log.last_entry().char_delta == after - before
+
     def test_observe_returns_observation_entry(self, tmp_path):
         ctx = make_ctx(tmp_path)
         entry = ctx.observe("🟢 Done")
@@ -135,8 +172,7 @@ class TestContextManagerAddMessage:
     def test_add_message_stored_in_session(self, tmp_path):
         ctx = make_ctx(tmp_path)
         ctx.add_message("user", "Hello")
-        assert len(ctx._session_messages) == 1
-        assert ctx._session_messages[0]["role"] == "user"
+        assert ctx._session_lines == ["[user]: Hello"]
 
     def test_observer_not_fired_below_threshold(self, tmp_path):
         ctx = make_ctx(tmp_path, observer_threshold=10_000)
@@ -161,7 +197,7 @@ class TestContextManagerAddMessage:
             observer_threshold=5,
         )
         ctx.add_message("user", "A message that exceeds the tiny threshold")
-        assert ctx._session_messages == []
+        assert ctx._session_lines == []
 
     def test_audit_log_updated_when_observer_writes(self, tmp_path):
         ctx = make_ctx(
@@ -183,6 +219,23 @@ class TestContextManagerAddMessage:
         ctx.add_message("user", "1234567890123456789012345678901234567890")  # 40 chars
         assert len(ctx._observation_log.entries()) == 1
 
+    def test_session_token_count_tracks_messages(self, tmp_path):
+        ctx = make_ctx(tmp_path, observer_threshold=10_000)
+        ctx.add_message("user", "a" * 40)
+        ctx.add_message("assistant", "b" * 40)
+        assert ctx._session_token_count() == 20
+
+    def test_session_token_count_resets_after_observer(self, tmp_path):
+        ctx = make_ctx(tmp_path, llm_response="🟢 Done", observer_threshold=5)
+        ctx.add_message("user", "A message that exceeds the tiny threshold")
+        assert ctx._session_token_count() == 0
+
+    def test_observer_receives_formatted_transcript(self, tmp_path):
+        ctx = make_ctx(tmp_path, llm_response="🟢 Done", observer_threshold=10)
+        ctx.add_message("user", "short")
+        ctx.add_message("assistant", "a reply long enough to trigger the observer")
+        sent = ctx._observer.llm.calls[0]["messages"][0]["content"]
+        assert sent == "[user]: short\n[assistant]: a reply long enough to trigger the observer"
 
 # ---------------------------------------------------------------------------
 # verify_integrity()
@@ -205,3 +258,72 @@ class TestContextManagerIntegrity:
         # Tamper with the file out-of-band
         ctx._observation_log.path.write_text("tampered content", encoding="utf-8")
         assert ctx.verify_integrity() is False
+
+    def test_verify_passes_after_crlf_observation(self, tmp_path):
+        ctx = make_ctx(tmp_path)
+        ctx.observe("🟢 first")
+        ctx.observe("🔴 line one\r\nline two")
+        assert ctx.verify_integrity() is True
+        assert make_ctx(tmp_path).verify_integrity() is True
+
+    def _rewrite_same_size(self, ctx):
+        import os
+        path = ctx._observation_log.path
+        st = os.stat(path)
+        path.write_text(path.read_text(encoding="utf-8").replace("approved", "rejected"),
+                        encoding="utf-8")
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    def test_verify_detects_same_size_rewrite_with_mtime_restored(self, tmp_path):
+        ctx = make_ctx(tmp_path)
+        ctx.observe("🔴 deploy to prod approved")
+        assert ctx.verify_integrity() is True
+        self._rewrite_same_size(ctx)
+        assert ctx.verify_integrity() is False
+
+    def test_verify_reads_disk_even_when_stamp_misses_the_change(self, tmp_path, monkeypatch):
+        # E.g. two writes within one tick of a coarse filesystem clock.
+        from agentctx.memory import observation_log
+        ctx = make_ctx(tmp_path)
+        ctx.observe("🔴 deploy to prod approved")
+        monkeypatch.setattr(observation_log, "stat_stamp", lambda st: (0, 0, 0, 0))
+        ctx._observation_log.current_hash()   # cache under the frozen stamp
+        self._rewrite_same_size(ctx)
+        assert ctx.verify_integrity() is False
+
+
+# ---------------------------------------------------------------------------
+# flush() / durable turn boundary
+# ---------------------------------------------------------------------------
+
+class TestContextManagerFlush:
+    def test_flush_fsyncs_each_log_once(self, tmp_path, monkeypatch):
+        import os
+        ctx = make_ctx(tmp_path)
+        ctx.observe("event")
+        synced = []
+        monkeypatch.setattr(os, "fsync", synced.append)
+        ctx.flush()
+        assert len(synced) == 2
+
+    def test_non_durable_turn_does_not_fsync(self, tmp_path, monkeypatch):
+        import os
+        synced = []
+        monkeypatch.setattr(os, "fsync", synced.append)
+        make_ctx(tmp_path).observe("event")
+        assert synced == []
+
+    def test_durable_turn_fsyncs_once_per_log(self, tmp_path, monkeypatch):
+        import os
+        from agentctx.testing import FakeLLMAdapter
+        synced = []
+        monkeypatch.setattr(os, "fsync", synced.append)
+        ctx = ContextManager(
+            storage_path=tmp_path / "memory", llm=FakeLLMAdapter(""), durable=True
+        )
+        ctx.observe("event")
+        assert len(synced) == 2
+        assert ctx.verify_integrity() is True
+
+    def test_flush_before_any_write(self, tmp_path):
+        make_ctx(tmp_path).flush()